@@ -56,6 +56,7 @@ export const endpoints = {
   health: '/health',
   generate: '/generate',
   status: (workflowId) => `/status/${workflowId}`,
+  documentation: (workflowId) => `/result/${workflowId}/documentation`,
   feedback: '/feedback',
   agentsStatus: '/agents/status',
   workflows: '/workflows',
@@ -75,6 +76,9 @@ export const apiService = {
   // Get workflow status
   getWorkflowStatus: (workflowId) => api.get(endpoints.status(workflowId)),
   
+  // Get generated markdown (kept out of the status payload)
+  getDocumentation: (workflowId) => api.get(endpoints.documentation(workflowId), { responseType: 'text' }),
+  
   // Submit feedback
   submitFeedback: (data) => api.post(endpoints.feedback, data),
   
@@ -38,6 +38,13 @@ const Documentation = () => {
         const workflowData = response.data.data;
         const result = workflowData.result;
         
+        // The markdown is served separately so status polls stay small
+        let content = result.documentation;
+        if (content === undefined && result.documentation_url) {
+          const documentationResponse = await apiService.getDocumentation(workflowId);
+          content = documentationResponse.data;
+        }
+        
         // Structure the documentation data from backend result
         const docData = {
           workflow_id: workflowId,
@@ -46,7 +53,7 @@ const Documentation = () => {
           status: workflowData.status,
           ai_generated: result.ai_generated || false,
           documentation: {
-            content: result.documentation || '# No documentation generated',
+            content: content || '# No documentation generated',
             translations: result.translations || {},
             diagrams: Array.isArray(result.diagrams) ? result.diagrams : 
                      typeof result.diagrams === 'string' ? [{ type: 'architecture', title: 'System Architecture', content: result.diagrams }] : [],
@@ -7,19 +7,34 @@ import asyncio
 import aiohttp
 import json
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class DocSuiteClient:
     """Client for testing the Technical Documentation Suite API"""
     
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip('/')
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def __aenter__(self) -> "DocSuiteClient":
+        # One session for every call, so requests share pooled keep-alive connections;
+        # the client only talks to one service, so the pool is sized for a single host
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=32, limit_per_host=8, ttl_dns_cache=300, enable_cleanup_closed=True
+            ),
+            timeout=aiohttp.ClientTimeout(total=60, connect=10)
+        )
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self._session.close()
+        self._session = None
     
     async def health_check(self) -> Dict[str, Any]:
         """Check if the service is healthy"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/health") as response:
-                return await response.json()
+        async with self._session.get(f"{self.base_url}/health") as response:
+            return await response.json()
     
     async def generate_documentation(self, repository_url: str, project_id: str) -> Dict[str, Any]:
         """Generate documentation for a repository"""
@@ -31,19 +46,17 @@ class DocSuiteClient:
             "target_audience": "developers"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/generate",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                return await response.json()
+        async with self._session.post(
+            f"{self.base_url}/generate",
+            json=payload,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            return await response.json()
     
     async def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         """Get the status of a workflow"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/status/{workflow_id}") as response:
-                return await response.json()
+        async with self._session.get(f"{self.base_url}/status/{workflow_id}") as response:
+            return await response.json()
     
     async def submit_feedback(self, workflow_id: str, rating: int = 4) -> Dict[str, Any]:
         """Submit feedback for a workflow"""
@@ -57,60 +70,70 @@ class DocSuiteClient:
             "comments": "Test feedback from automated test"
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{self.base_url}/feedback",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            ) as response:
-                return await response.json()
+        async with self._session.post(
+            f"{self.base_url}/feedback",
+            json=payload,
+            headers={"Content-Type": "application/json"}
+        ) as response:
+            return await response.json()
 
 async def run_tests(service_url: str):
     """Run comprehensive tests of the documentation suite"""
-    client = DocSuiteClient(service_url)
-    
-    print("🧪 Starting Technical Documentation Suite Tests")
-    print(f"🌐 Service URL: {service_url}")
-    print("-" * 60)
-    
-    # Test 1: Health Check
-    print("1️⃣  Testing health check...")
-    try:
-        health = await client.health_check()
-        print(f"✅ Health check passed: {health['status']}")
-    except Exception as e:
-        print(f"❌ Health check failed: {e}")
-        return
-    
-    # Test 2: Documentation Generation
-    print("\n2️⃣  Testing documentation generation...")
-    try:
-        result = await client.generate_documentation(
-            repository_url="https://github.com/fastapi/fastapi",
-            project_id="fastapi-test-docs"
-        )
-        print(f"✅ Documentation generation initiated")
-        print(f"📊 Result: {json.dumps(result, indent=2)}")
+    async with DocSuiteClient(service_url) as client:
+        print("🧪 Starting Technical Documentation Suite Tests")
+        print(f"🌐 Service URL: {service_url}")
+        print("-" * 60)
         
-        if result.get("success") and "data" in result:
-            workflow_id = result["data"].get("workflow_id")
-            if workflow_id:
-                print(f"📝 Workflow ID: {workflow_id}")
-                
-                # Test 3: Workflow Status
-                print("\n3️⃣  Testing workflow status...")
-                status = await client.get_workflow_status(workflow_id)
-                print(f"✅ Status retrieved: {status}")
-                
-                # Test 4: Feedback Submission
-                print("\n4️⃣  Testing feedback submission...")
-                feedback_result = await client.submit_feedback(workflow_id)
-                print(f"✅ Feedback submitted: {feedback_result}")
+        # Test 1: Health Check
+        print("1️⃣  Testing health check...")
+        try:
+            health = await client.health_check()
+            print(f"✅ Health check passed: {health['status']}")
+        except Exception as e:
+            print(f"❌ Health check failed: {e}")
+            return
+        
+        # Test 2: Documentation Generation
+        print("\n2️⃣  Testing documentation generation...")
+        try:
+            result = await client.generate_documentation(
+                repository_url="https://github.com/fastapi/fastapi",
+                project_id="fastapi-test-docs"
+            )
+            print(f"✅ Documentation generation initiated")
+            print(f"📊 Result: {json.dumps(result, indent=2)}")
             
-    except Exception as e:
-        print(f"❌ Documentation generation failed: {e}")
-    
-    print("\n🎉 All tests completed!")
+            if result.get("success") and "data" in result:
+                workflow_id = result["data"].get("workflow_id")
+                if workflow_id:
+                    print(f"📝 Workflow ID: {workflow_id}")
+                    
+                    # Tests 3 and 4 only need the workflow ID, so they run concurrently
+                    print("\n3️⃣  Testing workflow status...")
+                    print("4️⃣  Testing feedback submission...")
+                    # return_exceptions lets both requests finish before the session closes,
+                    # and a failure in one does not hide the result of the other
+                    status, feedback_result = await asyncio.wait_for(
+                        asyncio.gather(
+                            client.get_workflow_status(workflow_id),
+                            client.submit_feedback(workflow_id),
+                            return_exceptions=True
+                        ),
+                        timeout=30
+                    )
+                    if isinstance(status, Exception):
+                        print(f"❌ Status check failed: {status}")
+                    else:
+                        print(f"✅ Status retrieved: {status}")
+                    if isinstance(feedback_result, Exception):
+                        print(f"❌ Feedback submission failed: {feedback_result}")
+                    else:
+                        print(f"✅ Feedback submitted: {feedback_result}")
+                
+        except Exception as e:
+            print(f"❌ Documentation generation failed: {e}")
+        
+        print("\n🎉 All tests completed!")
 
 if __name__ == "__main__":
     import sys
@@ -36,13 +36,13 @@ class BaseAgent(ABC):
         self.processed_messages = 0
         self.start_time = datetime.now()
         
-        self.logger.info(f"Agent {self.name} ({self.agent_id}) initialized")
+        self.logger.info("Agent %s (%s) initialized", self.name, self.agent_id)
     
     async def start(self):
         """Start the agent's message processing loop"""
         self.is_running = True
         self.state = "running"
-        self.logger.info(f"Agent {self.name} started")
+        self.logger.info("Agent %s started", self.name)
         
         while self.is_running:
             try:
@@ -58,13 +58,13 @@ class BaseAgent(ABC):
                 # Continue running, just no messages to process
                 continue
             except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
+                self.logger.error("Error processing message: %s", e)
     
     async def stop(self):
         """Stop the agent"""
         self.is_running = False
         self.state = "stopped"
-        self.logger.info(f"Agent {self.name} stopped")
+        self.logger.info("Agent %s stopped", self.name)
     
     async def send_message(self, recipient_agent: 'BaseAgent', message_type: str, data: Dict[str, Any]):
         """Send a message to another agent"""
@@ -76,13 +76,13 @@ class BaseAgent(ABC):
         )
         
         await recipient_agent.receive_message(message)
-        self.logger.debug(f"Sent message {message_type} to {recipient_agent.name}")
+        self.logger.debug("Sent message %s to %s", message_type, recipient_agent.name)
         return message
     
     async def receive_message(self, message: Message):
         """Receive a message from another agent"""
         await self.message_queue.put(message)
-        self.logger.debug(f"Received message {message.type} from {message.sender}")
+        self.logger.debug("Received message %s from %s", message.type, message.sender)
     
     @abstractmethod
     async def handle_message(self, message: Message) -> Optional[Message]:
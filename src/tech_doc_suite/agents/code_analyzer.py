@@ -8,6 +8,12 @@ import ast
 from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent, Message
 
+# Source files the analyzer reads, by extension
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python", ".js": "javascript", ".ts": "typescript", ".java": "java", ".go": "go", ".c": "c",
+    ".cpp": "cpp", ".h": "cpp", ".hpp": "cpp", ".rb": "ruby", ".php": "php"
+}
+
 class CodeAnalyzerAgent(BaseAgent):
     """Agent responsible for analyzing code repositories"""
     
@@ -25,7 +31,7 @@ class CodeAnalyzerAgent(BaseAgent):
         elif message.type == "get_complexity_metrics":
             return await self._get_complexity_metrics(message)
         else:
-            self.logger.warning(f"Unknown message type: {message.type}")
+            self.logger.warning("Unknown message type: %s", message.type)
             return None
     
     async def _analyze_repository(self, message: Message) -> Message:
@@ -33,7 +39,7 @@ class CodeAnalyzerAgent(BaseAgent):
         repo_url = message.data.get("repository_url")
         project_id = message.data.get("project_id")
         
-        self.logger.info(f"Analyzing repository: {repo_url}")
+        self.logger.info("Analyzing repository: %s", repo_url)
         
         # Mock analysis for demo - in real implementation would clone and analyze repo
         analysis_result = {
@@ -238,71 +244,73 @@ class CodeAnalyzerAgent(BaseAgent):
 
     def analyze_repository(self, repo_path: str) -> Dict[str, Any]:
         """Analyze a real repository directory (multi-language)"""
-        structure = {}
+        directories = []
+        files = []
+        sources = {}
+        for root, dirs, names in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d != ".git"]
+            rel_root = os.path.relpath(root, repo_path)
+            if rel_root != ".":
+                directories.append(rel_root)
+            for name in names:
+                rel_path = os.path.join(rel_root, name) if rel_root != "." else name
+                files.append(rel_path)
+                if os.path.splitext(name)[1].lower() not in LANGUAGE_BY_EXTENSION:
+                    continue
+                try:
+                    with open(os.path.join(root, name), "r", encoding="utf-8", errors="ignore") as f:
+                        sources[rel_path] = f.read()
+                except OSError:
+                    continue
+        return self.analyze_sources(directories, files, sources)
+
+    def analyze_sources(self, directories: List[str], files: List[str], sources: Dict[str, str]) -> Dict[str, Any]:
+        """Analyze source text keyed by repository-relative path, e.g. fetched without a clone"""
         functions = []
         classes = []
         dependencies = set()
-        file_count = 0
         lines_of_code = 0
-        language_distribution = {}
-        api_endpoints = []
-        ext_map = {
-            ".py": "python", ".js": "javascript", ".ts": "typescript", ".java": "java", ".go": "go", ".c": "c", ".cpp": "cpp", ".h": "cpp", ".hpp": "cpp", ".rb": "ruby", ".php": "php"
-        }
         lang_files = {}
         
-        for root, dirs, files in os.walk(repo_path):
-            rel_root = os.path.relpath(root, repo_path)
-            for file in files:
-                ext = os.path.splitext(file)[1].lower()
-                lang = ext_map.get(ext)
-                if not lang:
-                    continue
-                file_count += 1
-                lang_files.setdefault(lang, 0)
-                lang_files[lang] += 1
-                file_path = os.path.join(root, file)
-                rel_path = os.path.join(rel_root, file) if rel_root != "." else file
-                try:
-                    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                        code = f.read()
-                        lines_of_code += len(code.splitlines())
-                        if lang == "python":
-                            py_result = self._analyze_python_file(code, rel_path)
-                            functions.extend(py_result["functions"])
-                            classes.extend(py_result["classes"])
-                            dependencies.update(py_result["imports"])
-                        elif lang in ("javascript", "typescript"):
-                            js_result = self._analyze_js_ts_file(code, rel_path)
-                            functions.extend(js_result["functions"])
-                            classes.extend(js_result["classes"])
-                            dependencies.update(js_result["imports"])
-                        elif lang == "java":
-                            java_result = self._analyze_java_file(code, rel_path)
-                            functions.extend(java_result["functions"])
-                            classes.extend(java_result["classes"])
-                            dependencies.update(java_result["imports"])
-                        # Add more language handlers as needed
-                except Exception as e:
+        for rel_path, code in sources.items():
+            lang = LANGUAGE_BY_EXTENSION[os.path.splitext(rel_path)[1].lower()]
+            lang_files[lang] = lang_files.get(lang, 0) + 1
+            lines_of_code += len(code.splitlines())
+            try:
+                if lang == "python":
+                    result = self._analyze_python_file(code, rel_path)
+                elif lang in ("javascript", "typescript"):
+                    result = self._analyze_js_ts_file(code, rel_path)
+                elif lang == "java":
+                    result = self._analyze_java_file(code, rel_path)
+                else:
+                    # Add more language handlers as needed
                     continue
+            except Exception:
+                continue
+            functions.extend(result["functions"])
+            classes.extend(result["classes"])
+            dependencies.update(result["imports"])
+        
         total = sum(lang_files.values())
-        for lang, count in lang_files.items():
-            language_distribution[lang] = round(count / total, 2) if total else 0
+        language_distribution = {
+            lang: round(count / total, 2) if total else 0 for lang, count in lang_files.items()
+        }
         # Basic structure (folders/files)
-        for root, dirs, files in os.walk(repo_path):
-            rel_root = os.path.relpath(root, repo_path)
-            structure.setdefault(rel_root, [])
-            for file in files:
-                structure[rel_root].append(file)
+        structure = {".": []}
+        for directory in directories:
+            structure.setdefault(directory, [])
+        for rel_path in files:
+            structure.setdefault(os.path.dirname(rel_path) or ".", []).append(os.path.basename(rel_path))
         return {
             "structure": structure,
             "functions": functions,
             "classes": classes,
             "dependencies": list(dependencies),
-            "file_count": file_count,
+            "file_count": len(sources),
             "lines_of_code": lines_of_code,
             "language_distribution": language_distribution,
-            "api_endpoints": api_endpoints
+            "api_endpoints": []
         }
 
     def _analyze_python_file(self, code: str, file_path: str) -> Dict[str, Any]:
@@ -2,32 +2,18 @@
 Documentation Writer Agent - Generates documentation from code analysis
 """
 
-from typing import Dict, Any, List, Optional
+import io
+import re
+import heapq
+import markdown
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from .base_agent import BaseAgent, Message
 from ..services.ai_service import ai_service
 
-class DocumentationWriterAgent(BaseAgent):
-    """Agent responsible for writing documentation"""
-    
-    def __init__(self, agent_id: str):
-        super().__init__(agent_id, "DocumentationWriter")
-        self.templates = self._load_templates()
-        self.supported_formats = ["markdown", "html", "rst"]
-    
-    async def handle_message(self, message: Message) -> Optional[Message]:
-        """Handle incoming messages"""
-        if message.type == "generate_documentation":
-            return await self._generate_documentation(message)
-        elif message.type == "format_documentation":
-            return await self._format_documentation(message)
-        else:
-            self.logger.warning(f"Unknown message type: {message.type}")
-            return None
-    
-    def _load_templates(self) -> Dict[str, str]:
-        """Load documentation templates"""
-        return {
-            "api_reference": """
+# Templates and output formats are fixed, so every agent instance shares them
+DOCUMENTATION_TEMPLATES: Dict[str, str] = {
+    "api_reference": """
 # {title} API Reference
 
 ## Overview
@@ -41,8 +27,8 @@ class DocumentationWriterAgent(BaseAgent):
 
 ## Examples
 {examples}
-            """,
-            "class_documentation": """
+    """,
+    "class_documentation": """
 ## {class_name}
 
 {description}
@@ -54,8 +40,8 @@ class DocumentationWriterAgent(BaseAgent):
 ```python
 {usage_example}
 ```
-            """,
-            "function_documentation": """
+    """,
+    "function_documentation": """
 ### {function_name}
 
 {description}
@@ -70,24 +56,81 @@ class DocumentationWriterAgent(BaseAgent):
 ```python
 {example}
 ```
-            """
-        }
+    """
+}
+
+SUPPORTED_FORMATS = ("markdown", "html", "rst")
+
+# Markdown ATX headings for reStructuredText output; fenced code blocks match first so they pass through
+HEADING_RE = re.compile(
+    r"^(?P<fence>```[\s\S]*?^```)|^(?P<level>#{1,6})[ \t]+(?P<title>[^\n]+?)(?:[ \t]+#+)?[ \t]*$",
+    re.MULTILINE
+)
+RST_UNDERLINES = "=-~^\"'"
+
+WORD_RE = re.compile(r"\S+")
+
+def count_words(text: str) -> int:
+    """Number of whitespace-separated words, counted without building a list of them"""
+    return sum(1 for _ in WORD_RE.finditer(text))
+
+# Conversions are pure, so documents formatted more than once are converted only once
+@lru_cache(maxsize=128)
+def convert_to_html(markdown_content: str) -> str:
+    """Convert markdown to HTML"""
+    html_content = markdown.markdown(markdown_content, extensions=["fenced_code", "tables"])
+    return f"<html><body>{html_content}</body></html>"
+
+def _rst_heading(match: re.Match) -> str:
+    if match.group("fence"):
+        return match.group("fence")
+    title = match.group("title")
+    return f"{title}\n{RST_UNDERLINES[len(match.group('level')) - 1] * len(title)}"
+
+@lru_cache(maxsize=128)
+def convert_to_rst(markdown_content: str) -> str:
+    """Convert markdown to reStructuredText (headings only)"""
+    return HEADING_RE.sub(_rst_heading, markdown_content)
+
+class DocumentationWriterAgent(BaseAgent):
+    """Agent responsible for writing documentation"""
+    
+    def __init__(self, agent_id: str):
+        super().__init__(agent_id, "DocumentationWriter")
+        self.templates = DOCUMENTATION_TEMPLATES
+        self.supported_formats = SUPPORTED_FORMATS
+    
+    async def handle_message(self, message: Message) -> Optional[Message]:
+        """Handle incoming messages"""
+        if message.type == "generate_documentation":
+            return await self._generate_documentation(message)
+        elif message.type == "format_documentation":
+            return await self._format_documentation(message)
+        else:
+            self.logger.warning("Unknown message type: %s", message.type)
+            return None
     
     async def _generate_documentation(self, message: Message) -> Message:
         """Generate documentation from analysis data using AI"""
         analysis_data = message.data.get("analysis", {})
         output_format = message.data.get("format", "markdown")
         target_audience = message.data.get("audience", "developers")
+        use_cache = message.data.get("use_cache", True)
         
-        self.logger.info(f"Generating AI-powered documentation for {analysis_data.get('project_id', 'unknown')}")
+        self.logger.info("Generating AI-powered documentation for %s", analysis_data.get('project_id', 'unknown'))
         
         try:
             # Use AI service for real documentation generation
-            full_documentation = await ai_service.generate_documentation(analysis_data, target_audience)
+            full_documentation = await ai_service.generate_model_documentation(analysis_data, target_audience, use_cache)
+            # Only model output is reported as AI-generated, so callers never cache a fallback as a result
+            ai_generated = full_documentation is not None
+            if not ai_generated:
+                full_documentation = ai_service._generate_fallback_documentation(analysis_data)
             
             # If AI-generated content is very short or empty, supplement with traditional sections
             if not full_documentation or len(full_documentation.strip()) < 100:
                 self.logger.info("AI response empty or too short, generating fallback documentation")
+                ai_generated = False
                 
                 # Create basic documentation even with minimal data
                 project_id = analysis_data.get("project_id", "Repository")
@@ -95,7 +138,8 @@ class DocumentationWriterAgent(BaseAgent):
                 file_count = analysis_data.get("file_count", 0)
                 lines_of_code = analysis_data.get("lines_of_code", 0)
                 
-                full_documentation = f"""# {project_id} Documentation
+                buffer = io.StringIO()
+                buffer.write(f"""# {project_id} Documentation
 
 ## Overview
 This repository has been analyzed by our AI-powered documentation system.
@@ -105,30 +149,16 @@ This repository has been analyzed by our AI-powered documentation system.
 **Lines of Code:** {lines_of_code}
 
 ## Analysis Results
-"""
+""")
                 
                 # Add traditional sections as available
-                traditional_sections = []
-                
-                if analysis_data.get("api_endpoints"):
-                    traditional_sections.append(self._generate_api_section(analysis_data["api_endpoints"]))
-                
-                if analysis_data.get("classes"):
-                    traditional_sections.append(self._generate_classes_section(analysis_data["classes"]))
-                
-                if analysis_data.get("functions"):
-                    traditional_sections.append(self._generate_functions_section(analysis_data["functions"]))
-                
-                if analysis_data.get("dependencies"):
-                    traditional_sections.append(self._generate_dependencies_section(analysis_data["dependencies"]))
-                
-                if analysis_data.get("structure"):
-                    traditional_sections.append(self._generate_structure_section(analysis_data["structure"]))
-                
-                if traditional_sections:
-                    full_documentation += "\n\n".join(traditional_sections)
-                else:
-                    full_documentation += """
+                traditional_sections = self._build_traditional_sections(analysis_data)
+                for index, section in enumerate(traditional_sections):
+                    if index:
+                        buffer.write("\n\n")
+                    buffer.write(section)
+                if not traditional_sections:
+                    buffer.write("""
 This repository appears to contain minimal code or configuration files. 
 The analysis did not detect significant code structures, functions, or classes to document.
 
@@ -139,43 +169,31 @@ The repository contains primarily configuration and metadata files.
 - Add more code files to generate comprehensive documentation
 - Ensure the repository contains analyzable source code
 - Check that the repository is publicly accessible
-"""
+""")
+                full_documentation = buffer.getvalue()
             else:
                 # AI generated good content, supplement if needed
                 if len(full_documentation) < 500:
                     self.logger.info("AI response adequate but short, supplementing with traditional documentation")
-                    traditional_sections = []
-                    
-                    if analysis_data.get("api_endpoints"):
-                        traditional_sections.append(self._generate_api_section(analysis_data["api_endpoints"]))
-                    
-                    if analysis_data.get("classes"):
-                        traditional_sections.append(self._generate_classes_section(analysis_data["classes"]))
-                    
-                    if analysis_data.get("functions"):
-                        traditional_sections.append(self._generate_functions_section(analysis_data["functions"]))
-                    
-                    if analysis_data.get("dependencies"):
-                        traditional_sections.append(self._generate_dependencies_section(analysis_data["dependencies"]))
+                    traditional_sections = self._build_traditional_sections(analysis_data)
                     
                     # Combine AI and traditional content
                     if traditional_sections:
-                        traditional_content = "\n\n".join(traditional_sections)
-                        full_documentation = f"{full_documentation}\n\n{traditional_content}"
+                        full_documentation = "\n\n".join([full_documentation, *traditional_sections])
             
             # Apply formatting
             if output_format == "html":
-                full_documentation = self._convert_to_html(full_documentation)
+                full_documentation = convert_to_html(full_documentation)
             elif output_format == "rst":
-                full_documentation = self._convert_to_rst(full_documentation)
+                full_documentation = convert_to_rst(full_documentation)
             
             return Message(
                 type="documentation_generated",
                 data={
                     "content": full_documentation,
                     "format": output_format,
-                    "ai_generated": ai_service.is_available(),
-                    "word_count": len(full_documentation.split()),
+                    "ai_generated": ai_generated,
+                    "word_count": count_words(full_documentation),
                     "target_audience": target_audience
                 },
                 sender=self.agent_id,
@@ -183,10 +201,21 @@ The repository contains primarily configuration and metadata files.
             )
             
         except Exception as e:
-            self.logger.error(f"Documentation generation failed: {e}")
+            self.logger.error("Documentation generation failed: %s", e)
             # Fallback to traditional generation
             return await self._generate_traditional_documentation(message)
     
+    def _build_traditional_sections(self, analysis_data: Dict[str, Any]) -> List[str]:
+        """Sections generated directly from whichever parts of the analysis are present"""
+        builders = (
+            ("api_endpoints", self._generate_api_section),
+            ("classes", self._generate_classes_section),
+            ("functions", self._generate_functions_section),
+            ("dependencies", self._generate_dependencies_section),
+            ("structure", self._generate_structure_section)
+        )
+        return [builder(analysis_data[key]) for key, builder in builders if analysis_data.get(key)]
+    
     def _generate_overview_section(self, analysis_data: Dict[str, Any]) -> str:
         """Generate project overview section"""
         project_id = analysis_data.get("project_id", "Unknown Project")
@@ -213,7 +242,7 @@ This project is a software repository with {file_count} files containing approxi
         if not endpoints:
             return ""
         
-        section = "## API Endpoints\n\n"
+        parts = ["## API Endpoints\n\n"]
         
         for endpoint in endpoints:
             method = endpoint.get("method", "GET")
@@ -221,22 +250,22 @@ This project is a software repository with {file_count} files containing approxi
             function = endpoint.get("function", "unknown")
             description = endpoint.get("description", f"Handles {method} requests to {path}")
             
-            section += f"""### {method} {path}
+            parts.append(f"""### {method} {path}
 
 **Function:** `{function}`
 
 {description}
 
-"""
+""")
         
-        return section
+        return "".join(parts)
     
     def _generate_classes_section(self, classes: List[Dict[str, Any]]) -> str:
         """Generate class documentation section"""
         if not classes:
             return ""
         
-        section = "## Classes\n\n"
+        parts = ["## Classes\n\n"]
         
         for cls in classes:
             name = cls.get("name", "Unknown")
@@ -244,28 +273,27 @@ This project is a software repository with {file_count} files containing approxi
             methods = cls.get("methods", [])
             inheritance = cls.get("inheritance", [])
             
-            section += f"""### {name}
+            parts.append(f"""### {name}
 
 {docstring}
 
-"""
+""")
             if inheritance:
-                section += f"**Inherits from:** {', '.join(inheritance)}\n\n"
+                parts.append(f"**Inherits from:** {', '.join(inheritance)}\n\n")
             
             if methods:
-                section += "**Methods:**\n"
-                for method in methods:
-                    section += f"- `{method}`\n"
-                section += "\n"
+                parts.append("**Methods:**\n")
+                parts.extend(f"- `{method}`\n" for method in methods)
+                parts.append("\n")
         
-        return section
+        return "".join(parts)
     
     def _generate_functions_section(self, functions: List[Dict[str, Any]]) -> str:
         """Generate function documentation section"""
         if not functions:
             return ""
         
-        section = "## Functions\n\n"
+        parts = ["## Functions\n\n"]
         
         for func in functions:
             name = func.get("name", "unknown")
@@ -273,16 +301,16 @@ This project is a software repository with {file_count} files containing approxi
             parameters = func.get("parameters", [])
             return_type = func.get("return_type", "Any")
             
-            section += f"""### {name}
+            parts.append(f"""### {name}
 
 {docstring}
 
 **Parameters:** {', '.join(parameters)}
 **Returns:** {return_type}
 
-"""
+""")
         
-        return section
+        return "".join(parts)
     
     async def _generate_traditional_documentation(self, message: Message) -> Message:
         """Fallback to traditional documentation generation"""
@@ -299,30 +327,17 @@ This project is a software repository with {file_count} files containing approxi
         if "repository_url" in analysis_data:
             sections.append(self._generate_overview_section(analysis_data))
         
-        # API documentation
-        if "api_endpoints" in analysis_data:
-            sections.append(self._generate_api_section(analysis_data["api_endpoints"]))
-        
-        # Class documentation
-        if "classes" in analysis_data:
-            sections.append(self._generate_classes_section(analysis_data["classes"]))
-        
-        # Function documentation  
-        if "functions" in analysis_data:
-            sections.append(self._generate_functions_section(analysis_data["functions"]))
-        
-        # Dependencies
-        if "dependencies" in analysis_data:
-            sections.append(self._generate_dependencies_section(analysis_data["dependencies"]))
+        # API, class, function, dependency and structure documentation
+        sections.extend(self._build_traditional_sections(analysis_data))
         
         # Combine all sections
         full_documentation = "\n\n".join(sections)
         
         # Apply formatting
         if output_format == "html":
-            full_documentation = self._convert_to_html(full_documentation)
+            full_documentation = convert_to_html(full_documentation)
         elif output_format == "rst":
-            full_documentation = self._convert_to_rst(full_documentation)
+            full_documentation = convert_to_rst(full_documentation)
         
         return Message(
             type="documentation_generated",
@@ -331,7 +346,7 @@ This project is a software repository with {file_count} files containing approxi
                 "format": output_format,
                 "ai_generated": False,
                 "sections": len(sections),
-                "word_count": len(full_documentation.split()),
+                "word_count": count_words(full_documentation),
                 "target_audience": target_audience
             },
             sender=self.agent_id,
@@ -343,60 +358,67 @@ This project is a software repository with {file_count} files containing approxi
         if not dependencies:
             return ""
         
-        section = "## Dependencies\n\n"
+        parts = ["## Dependencies\n\n"]
         
-        runtime_deps = [d for d in dependencies if d.get("type") == "runtime"]
-        dev_deps = [d for d in dependencies if d.get("type") == "development"]
+        runtime_deps = []
+        dev_deps = []
+        for dep in dependencies:
+            dep_type = dep.get("type")
+            if dep_type == "runtime":
+                runtime_deps.append(dep)
+            elif dep_type == "development":
+                dev_deps.append(dep)
         
         if runtime_deps:
-            section += "### Runtime Dependencies\n\n"
+            parts.append("### Runtime Dependencies\n\n")
             for dep in runtime_deps:
                 name = dep.get("name")
                 version = dep.get("version", "latest")
-                section += f"- **{name}** ({version})\n"
-            section += "\n"
+                parts.append(f"- **{name}** ({version})\n")
+            parts.append("\n")
         
         if dev_deps:
-            section += "### Development Dependencies\n\n"
+            parts.append("### Development Dependencies\n\n")
             for dep in dev_deps:
                 name = dep.get("name")
                 version = dep.get("version", "latest")
-                section += f"- **{name}** ({version})\n"
-            section += "\n"
+                parts.append(f"- **{name}** ({version})\n")
+            parts.append("\n")
         
-        return section
+        return "".join(parts)
     
     def _generate_structure_section(self, structure: Dict[str, Any]) -> str:
         """Generate repository structure section"""
         if not structure:
             return ""
         
-        section = "## Repository Structure\n\n"
+        parts = ["## Repository Structure\n\n"]
         
         # Get top-level directories and files
         root_items = structure.get(".", [])
         if root_items:
-            section += "### Root Directory\n\n"
+            parts.append("### Root Directory\n\n")
             for item in sorted(root_items):
                 if not item.startswith('.'):  # Skip hidden files
-                    section += f"- `{item}`\n"
-            section += "\n"
+                    parts.append(f"- `{item}`\n")
+            parts.append("\n")
         
         # Get other directories
         directories = [k for k in structure.keys() if k != "." and not k.startswith('.git')]
         if directories:
-            section += "### Directory Structure\n\n"
+            parts.append("### Directory Structure\n\n")
             for directory in sorted(directories):
                 files = structure[directory]
                 if files:
-                    section += f"**`{directory}/`**\n"
-                    for file in sorted(files)[:5]:  # Limit to first 5 files
-                        section += f"  - `{file}`\n"
-                    if len(files) > 5:
-                        section += f"  - ... and {len(files) - 5} more files\n"
-                    section += "\n"
-        
-        return section
+                    parts.append(f"**`{directory}/`**\n")
+                    for file in heapq.nsmallest(5, files):  # Limit to first 5 files
+                        parts.append(f"  - `{file}`\n")
+                    file_count = len(files)
+                    if file_count > 5:
+                        parts.append(f"  - ... and {file_count - 5} more files\n")
+                    parts.append("\n")
+        
+        return "".join(parts)
     
     async def _format_documentation(self, message: Message) -> Message:
         """Format documentation for different outputs"""
@@ -404,9 +426,10 @@ This project is a software repository with {file_count} files containing approxi
         target_format = message.data.get("target_format", "markdown")
         
         if target_format == "html":
-            formatted_content = self._convert_to_html(content)
+            # Documents generated as HTML are already converted
+            formatted_content = content if content.lstrip().startswith("<html") else convert_to_html(content)
         elif target_format == "rst":
-            formatted_content = self._convert_to_rst(content)
+            formatted_content = convert_to_rst(content)
         else:
             formatted_content = content  # Keep as markdown
         
@@ -420,33 +443,21 @@ This project is a software repository with {file_count} files containing approxi
             recipient=message.sender
         )
     
-    def _convert_to_html(self, markdown_content: str) -> str:
-        """Convert markdown to HTML (basic implementation)"""
-        # Simple markdown to HTML conversion
-        html_content = markdown_content
-        html_content = html_content.replace("# ", "<h1>").replace("\n", "</h1>\n", 1)
-        html_content = html_content.replace("## ", "<h2>").replace("\n", "</h2>\n", 1)
-        html_content = html_content.replace("### ", "<h3>").replace("\n", "</h3>\n", 1)
-        html_content = f"<html><body>{html_content}</body></html>"
-        return html_content
-    
-    def _convert_to_rst(self, markdown_content: str) -> str:
-        """Convert markdown to reStructuredText (basic implementation)"""
-        # Simple markdown to RST conversion
-        rst_content = markdown_content
-        rst_content = rst_content.replace("# ", "").replace("\n", "\n" + "="*50 + "\n", 1)
-        rst_content = rst_content.replace("## ", "").replace("\n", "\n" + "-"*30 + "\n", 1)
-        return rst_content
-
-    async def _generate_documentation_async(self, analysis_data: Dict[str, Any], target_audience: str = "developers") -> str:
-        """Generate documentation asynchronously - wrapper for main.py compatibility"""
+
+    async def _generate_documentation_async(self, analysis_data: Dict[str, Any], target_audience: str = "developers",
+                                            use_cache: bool = True) -> Tuple[str, bool]:
+        """Generate documentation asynchronously - wrapper for main.py compatibility
+        
+        Returns the content and whether it was written by the model rather than a fallback.
+        """
         try:
             message = Message(
                 type="generate_documentation",
                 data={
                     "analysis": analysis_data,
                     "format": "markdown",
-                    "audience": target_audience
+                    "audience": target_audience,
+                    "use_cache": use_cache
                 },
                 sender="main",
                 recipient=self.agent_id
@@ -456,11 +467,12 @@ This project is a software repository with {file_count} files containing approxi
             
             # Ensure result is a Message object and has data
             if hasattr(result, 'data') and isinstance(result.data, dict):
-                return result.data.get("content", "Documentation generation failed")
+                return (result.data.get("content", "Documentation generation failed"),
+                        bool(result.data.get("ai_generated")))
             else:
-                self.logger.error(f"Unexpected result type: {type(result)}")
-                return "Documentation generation failed - unexpected result format"
+                self.logger.error("Unexpected result type: %s", type(result))
+                return "Documentation generation failed - unexpected result format", False
                 
         except Exception as e:
-            self.logger.error(f"Documentation generation wrapper failed: {e}")
-            return f"Documentation generation failed: {str(e)}" 
\ No newline at end of file
+            self.logger.error("Documentation generation wrapper failed: %s", e)
+            return f"Documentation generation failed: {str(e)}", False
\ No newline at end of file
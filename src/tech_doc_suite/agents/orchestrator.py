@@ -62,7 +62,7 @@ class DiagramGeneratorAgent(BaseAgent):
                 "content": structure_diagram
             })
         except Exception as e:
-            logger.warning(f"Failed to generate structure diagram: {e}")
+            logger.warning("Failed to generate structure diagram: %s", e)
         
         # Generate class hierarchy diagram if classes exist
         classes = analysis_data.get('classes', [])
@@ -75,7 +75,7 @@ class DiagramGeneratorAgent(BaseAgent):
                     "content": class_diagram
                 })
             except Exception as e:
-                logger.warning(f"Failed to generate class diagram: {e}")
+                logger.warning("Failed to generate class diagram: %s", e)
         
         # Generate API flow diagram if endpoints exist
         endpoints = analysis_data.get('api_endpoints', [])
@@ -88,7 +88,7 @@ class DiagramGeneratorAgent(BaseAgent):
                     "content": api_diagram
                 })
             except Exception as e:
-                logger.warning(f"Failed to generate API diagram: {e}")
+                logger.warning("Failed to generate API diagram: %s", e)
         
         # Generate dependencies diagram
         dependencies = analysis_data.get('dependencies', [])
@@ -101,7 +101,7 @@ class DiagramGeneratorAgent(BaseAgent):
                     "content": deps_diagram
                 })
             except Exception as e:
-                logger.warning(f"Failed to generate dependencies diagram: {e}")
+                logger.warning("Failed to generate dependencies diagram: %s", e)
         
         # If no specific diagrams, create a general project overview
         if not diagrams:
@@ -120,7 +120,7 @@ class DiagramGeneratorAgent(BaseAgent):
         functions = analysis_data.get('functions', [])[:8]  # Limit to 8 functions
         classes = analysis_data.get('classes', [])[:6]  # Limit to 6 classes
         
-        logger.debug(f"Generating diagram for project: {project_name} with {len(functions)} functions, {len(classes)} classes")
+        logger.debug("Generating diagram for project: %s with %s functions, %s classes", project_name, len(functions), len(classes))
         
         diagram = f"graph TD\n    A[\"{project_name}\"]\n"
         
@@ -176,7 +176,7 @@ class DiagramGeneratorAgent(BaseAgent):
                     safe_name = str(dep).replace(' ', '_').replace('-', '_').replace('.', '_')[:15]
                     diagram += f"    DEP --> DEP{i+1}[\"{safe_name}\"]\n"
         
-        logger.debug(f"Generated diagram with {len(diagram)} characters")
+        logger.debug("Generated diagram with %s characters", len(diagram))
         return diagram
     
     def _generate_repository_class_diagram(self, analysis_data: Dict[str, Any]) -> str:
@@ -236,7 +236,7 @@ class DiagramGeneratorAgent(BaseAgent):
         dependencies = analysis_data.get('dependencies', [])[:12]  # Limit to prevent overflow
         project_name = analysis_data.get('project_id', 'Project').replace(' ', '_').replace('-', '_')
         
-        logger.debug(f"Generating dependencies diagram with {len(dependencies)} dependencies")
+        logger.debug("Generating dependencies diagram with %s dependencies", len(dependencies))
         
         diagram = f"graph TD\n    PROJECT[\"{project_name}\"]\n"
         
@@ -3,6 +3,7 @@ Translation Agent - Translates documentation to multiple languages
 Built for the Google Cloud ADK Hackathon
 """
 
+import asyncio
 from typing import Dict, Any, List, Optional
 from .base_agent import BaseAgent, Message
 from ..services.ai_service import ai_service
@@ -10,6 +11,9 @@ from ..services.ai_service import ai_service
 class TranslationAgent(BaseAgent):
     """Agent responsible for translating documentation to multiple languages"""
     
+    # Upper bound on translation requests in flight to the LLM provider
+    max_concurrent_translations = 8
+    
     def __init__(self, agent_id: str):
         super().__init__(agent_id, "TranslationAgent")
         self.supported_languages = {
@@ -47,7 +51,7 @@ class TranslationAgent(BaseAgent):
         elif message.type == "get_supported_languages":
             return await self._get_supported_languages(message)
         else:
-            self.logger.warning(f"Unknown message type: {message.type}")
+            self.logger.warning("Unknown message type: %s", message.type)
             return None
     
     async def _get_supported_languages(self, message: Message) -> Message:
@@ -68,7 +72,7 @@ class TranslationAgent(BaseAgent):
         selected_languages = message.data.get("languages", [])
         project_context = message.data.get("project_context", {})
         
-        self.logger.info(f"Translating documentation to {len(selected_languages)} languages")
+        self.logger.info("Translating documentation to %s languages", len(selected_languages))
         
         if not original_content:
             return Message(
@@ -94,42 +98,57 @@ class TranslationAgent(BaseAgent):
             "failed_translations": 0
         }
         
+        target_languages = []
         for lang_code in selected_languages:
             if lang_code not in self.supported_languages:
-                self.logger.warning(f"Unsupported language: {lang_code}")
+                self.logger.warning("Unsupported language: %s", lang_code)
                 continue
-                
-            try:
-                language_info = self.supported_languages[lang_code]
-                self.logger.info(f"Translating to {language_info['name']} ({lang_code})")
-                
-                translated_content = await self._perform_translation(
-                    original_content, 
-                    language_info,
-                    project_context
-                )
-                
-                translations[lang_code] = {
-                    "content": translated_content,
-                    "language": language_info,
-                    "word_count": len(translated_content.split()),
-                    "character_count": len(translated_content),
-                    "status": "success"
-                }
-                
-                translation_stats["successful_translations"] += 1
-                
-            except Exception as e:
-                self.logger.error(f"Translation to {lang_code} failed: {e}")
+            target_languages.append(lang_code)
+        
+        # Languages are independent LLM calls, so translate them concurrently
+        limit = asyncio.Semaphore(self.max_concurrent_translations)
+        
+        async def translate_one(lang_code: str) -> Optional[str]:
+            language_info = self.supported_languages[lang_code]
+            async with limit:
+                self.logger.info("Translating to %s (%s)", language_info['name'], lang_code)
+                return await self._perform_translation(original_content, language_info, project_context)
+        
+        results = await asyncio.gather(*(translate_one(code) for code in target_languages), return_exceptions=True)
+        
+        for lang_code, translated_content in zip(target_languages, results):
+            if isinstance(translated_content, Exception):
+                self.logger.error("Translation to %s failed: %s", lang_code, translated_content)
                 translations[lang_code] = {
                     "content": "",
                     "language": self.supported_languages[lang_code],
                     "word_count": 0,
                     "character_count": 0,
                     "status": "failed",
-                    "error": str(e)
+                    "error": str(translated_content)
                 }
                 translation_stats["failed_translations"] += 1
+            elif translated_content is None:
+                # Placeholder shown in place of a translation; counted as failed so it is never cached
+                placeholder = self._fallback_translation(original_content, self.supported_languages[lang_code])
+                translations[lang_code] = {
+                    "content": placeholder,
+                    "language": self.supported_languages[lang_code],
+                    "word_count": len(placeholder.split()),
+                    "character_count": len(placeholder),
+                    "status": "failed",
+                    "error": "AI translation unavailable or failed"
+                }
+                translation_stats["failed_translations"] += 1
+            else:
+                translations[lang_code] = {
+                    "content": translated_content,
+                    "language": self.supported_languages[lang_code],
+                    "word_count": len(translated_content.split()),
+                    "character_count": len(translated_content),
+                    "status": "success"
+                }
+                translation_stats["successful_translations"] += 1
             
             translation_stats["languages_processed"] += 1
         
@@ -145,23 +164,51 @@ class TranslationAgent(BaseAgent):
             recipient=message.sender
         )
     
-    async def _perform_translation(self, content: str, language_info: Dict[str, Any], project_context: Dict[str, Any]) -> str:
-        """Perform the actual translation using AI service"""
+    async def _perform_translation(self, content: str, language_info: Dict[str, Any],
+                                   project_context: Dict[str, Any]) -> Optional[str]:
+        """Perform the actual translation using AI service; None when the model produced no translation"""
         if not ai_service.is_available():
-            return self._fallback_translation(content, language_info)
+            return None
         
         try:
             # Use the proper AI service translate_content method
-            translated_content = await ai_service.translate_content(
+            return await ai_service.translate_content(
                 content=content,
                 target_language=language_info,
                 context=project_context
             )
-            return translated_content
             
         except Exception as e:
-            self.logger.error(f"AI translation failed: {e}")
-            return self._fallback_translation(content, language_info)
+            self.logger.error("AI translation failed: %s", e)
+            return None
+    
+    async def _perform_batch_translation(self, content: str, language_keys: List[str], project_context: Dict[str, Any],
+                                         max_concurrency: int = 4) -> Dict[str, Optional[str]]:
+        """Translate into every language with one AI request, falling back to per-language requests
+        
+        A language whose per-language request also fails maps to None.
+        """
+        if not ai_service.is_available():
+            return {key: self._fallback_translation(content, self.supported_languages[key]) for key in language_keys}
+        
+        target_languages = {key: self.supported_languages[key] for key in language_keys}
+        translations = await ai_service.translate_content_batch(
+            content=content,
+            target_languages=target_languages,
+            context=project_context
+        )
+        if translations is not None:
+            return translations
+        
+        self.logger.warning("Batch translation unusable, translating each language separately")
+        limit = asyncio.Semaphore(max_concurrency)
+        
+        async def translate_one(language_info: Dict[str, Any]) -> str:
+            async with limit:
+                return await self._perform_translation(content, language_info, project_context)
+        
+        results = await asyncio.gather(*(translate_one(info) for info in target_languages.values()))
+        return dict(zip(language_keys, results))
     
     def _fallback_translation(self, content: str, language_info: Dict[str, Any]) -> str:
         """Fallback translation when AI is not available"""
@@ -3,46 +3,204 @@ Configuration settings for Technical Documentation Suite
 """
 
 import os
+import sys
+import atexit
+import queue
+import threading
+import time
 import logging
+import logging.handlers
+from functools import cache, lru_cache
 from pathlib import Path
+from typing import Optional
+
+@cache
+def _env(name: str, default=None):
+    """Read an environment variable once; call ``_env.cache_clear()`` to re-read"""
+    return os.environ.get(name, default)
 
 # Environment detection
-ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
+ENVIRONMENT = _env('ENVIRONMENT', 'development')
 DEBUG = ENVIRONMENT == 'development'
 
 # Server configuration
-PORT = int(os.getenv('PORT', 8080))
-HOST = os.getenv('HOST', '0.0.0.0')
+PORT = int(_env('PORT', 8080))
+HOST = _env('HOST', '0.0.0.0')
 
 # API Configuration
-GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-API_TIMEOUT = int(os.getenv('API_TIMEOUT', 300))  # 5 minutes default
+GEMINI_API_KEY = _env('GEMINI_API_KEY')
+API_TIMEOUT = int(_env('API_TIMEOUT', 300))  # 5 minutes default
 
 # Logging configuration
-LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO' if not DEBUG else 'DEBUG')
-LOG_FILE = os.getenv('LOG_FILE', 'app.log')
+LOG_LEVEL = _env('LOG_LEVEL', 'INFO' if not DEBUG else 'DEBUG')
+LOG_FILE = _env('LOG_FILE', 'app.log')
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_BUFFER_SIZE = int(_env('LOG_BUFFER_SIZE', 65536))  # bytes buffered before a write
+LOG_FLUSH_INTERVAL = float(_env('LOG_FLUSH_INTERVAL', 30))  # seconds between timed flushes
+LOG_MAX_BYTES = int(_env('LOG_MAX_BYTES', 1_048_576))  # rotate after 1 MiB
+LOG_BACKUP_COUNT = int(_env('LOG_BACKUP_COUNT', 5))
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the ``asctime`` seconds part once per second"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_time = (None, '')  # (whole second, rendered string)
+    
+    def formatTime(self, record, datefmt=None):
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, rendered = self._last_time
+        if second != cached_second:
+            rendered = time.strftime(self.default_time_format, self.converter(record.created))
+            self._last_time = (second, rendered)
+        return self.default_msec_format % (rendered, record.msecs)
+
+class LogFormatter(CachedTimeFormatter):
+    """CachedTimeFormatter specialised to LOG_FORMAT
+    
+    Builds the line by direct string formatting instead of going through the
+    %-style format machinery; the output matches ``Formatter(LOG_FORMAT)``.
+    """
+    
+    def __init__(self):
+        super().__init__(LOG_FORMAT)
+    
+    def format(self, record):
+        record.message = record.getMessage()
+        line = f"{self.formatTime(record)} - {record.name} - {record.levelname} - {record.message}"
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        if record.stack_info:
+            line = f"{line}\n{self.formatStack(record.stack_info)}"
+        return line
+
+# Formatters are shared by every handler setup_logging() creates
+_FORMATTER = LogFormatter()
+_MESSAGE_FORMATTER = logging.Formatter('%(message)s')
 
 # Google Cloud Configuration
-GOOGLE_CLOUD_PROJECT = os.getenv('GOOGLE_CLOUD_PROJECT')
-GOOGLE_APPLICATION_CREDENTIALS = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
+GOOGLE_CLOUD_PROJECT = _env('GOOGLE_CLOUD_PROJECT')
+GOOGLE_APPLICATION_CREDENTIALS = _env('GOOGLE_APPLICATION_CREDENTIALS')
 
-# CORS Configuration
-ALLOWED_ORIGINS = os.getenv('ALLOWED_ORIGINS', 'http://localhost:3000').split(',')
+# CORS Configuration: comma-separated origins, every origin unless set
+ALLOWED_ORIGINS = frozenset(
+    origin.strip()
+    for origin in _env('ALLOWED_ORIGINS', '*').split(',')
+    if origin.strip()
+)
 
 # Security
-SECRET_KEY = os.getenv('SECRET_KEY', 'development-key-change-in-production')
+SECRET_KEY = _env('SECRET_KEY', 'development-key-change-in-production')
 
 # File paths
 BASE_DIR = Path(__file__).parent
 STATIC_DIR = BASE_DIR / 'frontend' / 'build'
 LOG_DIR = BASE_DIR / 'logs'
 
-# Ensure log directory exists
-LOG_DIR.mkdir(exist_ok=True)
+@cache
+def _ensure_log_dir() -> Path:
+    """Create the log directory the first time file logging is enabled"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LOG_DIR
+
+class BufferedFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that batches writes in a large buffer instead of flushing per record
+    
+    The buffer is flushed when it fills, every ``flush_interval`` seconds,
+    immediately for ERROR and above, and when the handler is closed. The
+    rollover check uses a running size count so it never has to seek (and
+    thereby flush) the buffered stream.
+    """
+    
+    def __init__(self, filename, buffer_size: int = LOG_BUFFER_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, **kwargs):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._flush_timer: Optional[threading.Timer] = None
+        self._size = 0
+        super().__init__(filename, **kwargs)
+        self._schedule_flush()
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.buffer_size,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = stream.tell()
+        return stream
+    
+    def _schedule_flush(self):
+        self._flush_timer = threading.Timer(self.flush_interval, self._timed_flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+    
+    def _timed_flush(self):
+        self.flush()
+        if self._flush_timer is not None:
+            self._schedule_flush()
+    
+    def emit(self, record):
+        try:
+            message = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._size + len(message) >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(message)
+            self._size += len(message)
+            if record.levelno >= logging.ERROR:
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def close(self):
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        super().close()
+
+# Background listener that performs file I/O off the calling thread, and the file handler it feeds
+_log_listener: Optional[logging.handlers.QueueListener] = None
+_log_file_handler: Optional[BufferedFileHandler] = None
+_logging_configured = False
+
+def _stop_log_listener():
+    """Drain queued records, stop the background log listener and close its file handler
+    
+    Registered with atexit once, so the buffered file is flushed on shutdown.
+    """
+    global _log_listener, _log_file_handler
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+    if _log_file_handler is not None:
+        _log_file_handler.close()
+        _log_file_handler = None
+
+atexit.register(_stop_log_listener)
 
-def setup_logging():
-    """Configure application logging"""
+def setup_logging(force: bool = False):
+    """Configure application logging
+    
+    Only the first call does any work; pass ``force=True`` to rebuild the
+    handlers (e.g. after changing settings in tests).
+    """
+    global _log_listener, _log_file_handler, _logging_configured
+    
+    if _logging_configured and not force:
+        return
+    
+    # LOG_FORMAT never uses thread or process fields, so skip collecting them
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     
     # Set log level
     level = getattr(logging, LOG_LEVEL.upper(), logging.INFO)
@@ -50,36 +208,68 @@ def setup_logging():
     # Configure logging
     handlers = []
     
-    # Console handler for development
+    # Console handler for development only; writes to line-buffered stdout
     if DEBUG:
-        console_handler = logging.StreamHandler()
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(line_buffering=True)
+        console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(level)
-        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        console_handler.setFormatter(_FORMATTER)
         handlers.append(console_handler)
     
-    # File handler for production
-    if not DEBUG or os.getenv('LOG_TO_FILE'):
-        file_handler = logging.FileHandler(LOG_DIR / LOG_FILE)
+    # Stop a listener left over from a forced reconfiguration
+    _stop_log_listener()
+    
+    # File handler for production, buffered so records are written in batches
+    # and only ERROR+, a full buffer or the flush timer forces a write to disk.
+    # Callers only enqueue records; a listener thread hands them to the file handler.
+    if not DEBUG or _env('LOG_TO_FILE'):
+        file_handler = BufferedFileHandler(
+            _ensure_log_dir() / LOG_FILE,
+            maxBytes=LOG_MAX_BYTES,
+            backupCount=LOG_BACKUP_COUNT,
+            delay=True
+        )
         file_handler.setLevel(level)
-        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
-        handlers.append(file_handler)
-    
-    # Basic config
-    logging.basicConfig(
-        level=level,
-        format=LOG_FORMAT,
-        handlers=handlers,
-        force=True
-    )
-    
-    # Suppress noisy third-party loggers in production
+        file_handler.setFormatter(_FORMATTER)
+        _log_file_handler = file_handler
+        
+        log_queue = queue.SimpleQueue()
+        _log_listener = logging.handlers.QueueListener(
+            log_queue, file_handler, respect_handler_level=True
+        )
+        _log_listener.start()
+        
+        # The listener's handler applies LOG_FORMAT; only merge args here
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.setFormatter(_MESSAGE_FORMATTER)
+        handlers.append(queue_handler)
+    
+    # Install handlers on the root logger, closing any previous ones
+    root = logging.getLogger()
+    for old_handler in root.handlers[:]:
+        root.removeHandler(old_handler)
+        old_handler.close()
+    root.setLevel(level)
+    for handler in handlers:
+        root.addHandler(handler)
+    _logging_configured = True
+    
+    # Suppress noisy third-party loggers in production. The access log fires on
+    # every request and Cloud Run already records requests, so it is disabled
+    # outright; the HTTP client loggers still pass warnings through.
     if not DEBUG:
-        logging.getLogger('uvicorn.access').setLevel(logging.WARNING)
+        logging.getLogger('uvicorn.access').disabled = True
         logging.getLogger('httpx').setLevel(logging.WARNING)
         logging.getLogger('urllib3').setLevel(logging.WARNING)
 
+@lru_cache(maxsize=1)
 def get_ai_status():
-    """Get AI service status"""
+    """Get AI service status
+    
+    Built once from environment-derived settings; the returned dict is shared,
+    so callers must not mutate it.
+    """
     return {
         "enabled": GEMINI_API_KEY is not None,
         "api_key_set": bool(GEMINI_API_KEY),
@@ -94,4 +284,4 @@ APP_INFO = {
     "description": "AI-Powered Multi-Agent Documentation Generator",
     "author": "Google Cloud ADK Hackathon Team",
     "built_for": "Google Cloud ADK Hackathon 2024"
-} 
\ No newline at end of file
+}
@@ -3,10 +3,14 @@ AI Service - Real AI-powered documentation generation using Gemini API
 """
 
 import os
+import json
+import asyncio
 import logging
 import google.generativeai as genai
 from typing import Dict, Any, List, Optional
 
+from .analysis_cache import ai_documentation_cache
+
 logger = logging.getLogger(__name__)
 
 class AIService:
@@ -25,56 +29,111 @@ class AIService:
             self.model = genai.GenerativeModel('gemini-1.5-pro')
             logger.info("Gemini AI service initialized successfully")
         except Exception as e:
-            logger.error(f"Failed to initialize Gemini AI service: {e}")
+            logger.error("Failed to initialize Gemini AI service: %s", e)
             self.model = None
     
     def is_available(self) -> bool:
         """Check if AI service is available"""
         return self.model is not None
     
-    async def generate_documentation(self, analysis_data: Dict[str, Any], target_audience: str = "developers") -> str:
+    async def generate_documentation(self, analysis_data: Dict[str, Any], target_audience: str = "developers",
+                                     use_cache: bool = True) -> str:
         """Generate comprehensive documentation using AI"""
+        documentation = await self.generate_model_documentation(analysis_data, target_audience, use_cache)
+        if documentation is None:
+            return self._generate_fallback_documentation(analysis_data)
+        return documentation
+    
+    async def generate_model_documentation(self, analysis_data: Dict[str, Any], target_audience: str = "developers",
+                                           use_cache: bool = True) -> Optional[str]:
+        """Documentation written by the model, or None when it is unavailable or failed"""
         if not self.is_available():
             logger.warning("AI service not available, using fallback documentation")
-            return self._generate_fallback_documentation(analysis_data)
+            return None
+        
+        prompt = self._create_documentation_prompt(analysis_data, target_audience)
+        
+        # The prompt holds everything the model sees, so an identical prompt reuses the last answer
+        cached = await asyncio.to_thread(ai_documentation_cache.get, prompt) if use_cache else None
+        if cached is not None:
+            logger.info("AI documentation served from the disk cache")
+            return cached
         
         try:
-            prompt = self._create_documentation_prompt(analysis_data, target_audience)
-            
-            response = self.model.generate_content(prompt)
+            # The Gemini client blocks, so it runs on a worker thread to keep the event loop free
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
             
             if response and response.text:
                 logger.info("AI documentation generated successfully")
+                await asyncio.to_thread(ai_documentation_cache.set, prompt, response.text)
                 return response.text
             else:
                 logger.warning("AI service returned empty response, using fallback")
-                return self._generate_fallback_documentation(analysis_data)
                 
         except Exception as e:
-            logger.error(f"AI documentation generation failed: {e}")
-            return self._generate_fallback_documentation(analysis_data)
+            logger.error("AI documentation generation failed: %s", e)
+        
+        # An expired answer for the same prompt still beats the generic fallback
+        stale = await asyncio.to_thread(ai_documentation_cache.get, prompt, True)
+        if stale is not None:
+            logger.info("Serving previously generated AI documentation")
+            return stale
+        return None
     
-    async def translate_content(self, content: str, target_language: Dict[str, str], context: Dict[str, Any] = None) -> str:
-        """Translate content to target language using AI"""
+    async def translate_content(self, content: str, target_language: Dict[str, str],
+                                context: Dict[str, Any] = None) -> Optional[str]:
+        """Translate content to target language using AI; None if no translation was produced"""
         if not self.is_available():
             logger.warning("AI service not available for translation")
-            return f"Translation to {target_language.get('name', 'Unknown')} not available. Original content:\n\n{content}"
+            return None
         
         try:
             prompt = self._create_translation_prompt(content, target_language, context)
             
-            response = self.model.generate_content(prompt)
+            response = await asyncio.to_thread(self.model.generate_content, prompt)
             
             if response and response.text:
-                logger.info(f"Translation to {target_language.get('name')} completed successfully")
+                logger.info("Translation to %s completed successfully", target_language.get('name'))
                 return response.text
             else:
-                logger.warning(f"Translation to {target_language.get('name')} failed, returning original")
-                return content
+                logger.warning("Translation to %s returned no text", target_language.get('name'))
+                return None
+                
+        except Exception as e:
+            logger.error("Translation failed: %s", e)
+            return None
+    
+    async def translate_content_batch(self, content: str, target_languages: Dict[str, Dict[str, str]],
+                                      context: Dict[str, Any] = None) -> Optional[Dict[str, str]]:
+        """Translate content into several languages with a single request; None if unusable"""
+        if not self.is_available() or not target_languages:
+            return None
+        
+        try:
+            prompt = self._create_batch_translation_prompt(content, target_languages, context)
+            
+            response = await asyncio.to_thread(
+                self.model.generate_content,
+                prompt,
+                generation_config={"response_mime_type": "application/json"}
+            )
+            
+            translations = json.loads(response.text) if response and response.text else None
+            if not isinstance(translations, dict):
+                logger.warning("Batch translation returned no JSON object")
+                return None
+            
+            missing = [key for key in target_languages if not isinstance(translations.get(key), str)]
+            if missing:
+                logger.warning("Batch translation missing languages: %s", missing)
+                return None
+            
+            logger.info("Batch translation to %s languages completed successfully", len(target_languages))
+            return {key: translations[key] for key in target_languages}
                 
         except Exception as e:
-            logger.error(f"Translation failed: {e}")
-            return content
+            logger.error("Batch translation failed: %s", e)
+            return None
     
     def _generate_text(self, prompt: str) -> Optional[str]:
         """Generate text using Gemini API"""
@@ -85,7 +144,7 @@ class AIService:
             response = self.model.generate_content(prompt)
             return response.text if response else None
         except Exception as e:
-            logger.error(f"Gemini API call failed: {e}")
+            logger.error("Gemini API call failed: %s", e)
             return None
     
     def _create_documentation_prompt(self, analysis_data: Dict[str, Any], target_audience: str) -> str:
@@ -193,6 +252,41 @@ CONTENT TO TRANSLATE:
 {content}
 
 Provide the complete translated documentation maintaining the exact same structure and formatting.
+"""
+        
+        return prompt
+    
+    def _create_batch_translation_prompt(self, content: str, target_languages: Dict[str, Dict[str, str]],
+                                         context: Dict[str, Any] = None) -> str:
+        """Create prompt for translating content into several languages at once"""
+        
+        language_lines = "\n".join(
+            f'- "{key}": {info.get("name", "Unknown")} ({info.get("code", "unknown")})'
+            for key, info in target_languages.items()
+        )
+        
+        prompt = f"""
+Translate the following technical documentation into each of these languages:
+
+{language_lines}
+
+TRANSLATION REQUIREMENTS:
+1. Maintain all Markdown formatting exactly
+2. Preserve all code blocks unchanged
+3. Keep all URLs and links intact
+4. Translate technical terms appropriately for developers in each language
+5. Maintain professional, technical tone
+6. Keep section headers clear and consistent
+7. Preserve all examples and code snippets
+8. Ensure cultural appropriateness for speakers of each language
+
+OUTPUT FORMAT:
+Return a single JSON object whose keys are exactly the quoted language keys above and whose
+values are the complete translated documentation as Markdown strings.
+
+CONTENT TO TRANSLATE:
+
+{content}
 """
         
         return prompt
@@ -0,0 +1,161 @@
+"""
+Analysis Cache - Reuse repository analysis and documentation for unchanged commits
+Entries are keyed by the remote commit SHA, so a new push always misses the cache
+Translations are keyed by a hash of their content, languages and project context
+Diagrams and quality reviews are keyed by a hash of the analysis (and documentation) they derive from
+AI documentation is kept on disk, keyed by its prompt, so it survives restarts
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from collections import OrderedDict
+from contextlib import suppress
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """Small in-process LRU cache with a per-entry time to live"""
+
+    def __init__(self, max_entries: int = 128, ttl: float = 86400):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedAnalysisCache:
+    """Local LRU in front of Redis, so every worker reuses a commit analyzed by any of them"""
+
+    def __init__(self, local: AnalysisCache, client=None, prefix: str = "cache:"):
+        self.local = local
+        self.client = client  # redis.asyncio client, or None for a process-local cache
+        self.prefix = prefix
+
+    def _redis_key(self, key: Hashable) -> str:
+        return self.prefix + hashlib.sha256(json.dumps(key, default=str).encode()).hexdigest()
+
+    async def get(self, key: Hashable) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None or self.client is None:
+            return value
+
+        try:
+            raw = await self.client.get(self._redis_key(key))
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if raw is None:
+            return None
+
+        value = json.loads(raw)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: Hashable, value: Any):
+        self.local.set(key, value)
+        if self.client is None:
+            return
+
+        try:
+            await self.client.set(self._redis_key(key), json.dumps(value), ex=int(self.local.ttl))
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+
+class DiskCache:
+    """Text values stored as one file per key digest; expired entries stay as a stale fallback until evicted"""
+
+    def __init__(self, directory: str, ttl: float = 1800, max_entries: int = 512):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._directory_ready = False  # created on the first write, not at import
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
+    @staticmethod
+    def _mtime(path: str) -> float:
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[str]:
+        path = self._path(key)
+        try:
+            if not allow_stale and os.path.getmtime(path) + self.ttl < time.time():
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def set(self, key: str, value: str):
+        tmp_path = None
+        try:
+            if not self._directory_ready:
+                os.makedirs(self.directory, exist_ok=True)
+                self._directory_ready = True
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(value)
+            # Atomic rename, so readers never see a partially written entry
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            logger.warning("Disk cache write failed: %s", e)
+            # Eviction skips temporary files, so a failed write must not leave one behind
+            if tmp_path is not None:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+
+    def _evict(self):
+        names = [name for name in os.listdir(self.directory) if not name.endswith(".tmp")]
+        if len(names) <= self.max_entries:
+            return
+        paths = sorted((os.path.join(self.directory, name) for name in names), key=self._mtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Global instances
+analysis_cache = AnalysisCache()
+documentation_cache = AnalysisCache()
+translation_cache = AnalysisCache(max_entries=256, ttl=3600)
+diagram_cache = AnalysisCache()
+quality_cache = AnalysisCache()
+ai_documentation_cache = DiskCache(
+    os.getenv('DOC_CACHE_DIR') or os.path.join(tempfile.gettempdir(), 'docsuite-documentation-cache'),
+    ttl=int(os.getenv('DOC_CACHE_TTL', '1800'))
+)
@@ -4,10 +4,17 @@ Supports both public and private repositories via GitHub tokens
 """
 
 import os
-import requests
+import httpx
 import base64
+import asyncio
+import hashlib
 from typing import Optional, Dict, List, Any
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs, quote
+
+from .analysis_cache import AnalysisCache
+
+# Read-only GitHub lookups are served from memory for this long
+GITHUB_CACHE_TTL = int(os.getenv('GITHUB_CACHE_TTL', '120'))
 
 
 class GitHubService:
@@ -15,8 +22,90 @@ class GitHubService:
         self.base_url = "https://api.github.com"
         self.client_id = os.getenv('GITHUB_CLIENT_ID')
         self.client_secret = os.getenv('GITHUB_CLIENT_SECRET')
+        self._client: Optional[httpx.AsyncClient] = None
+        # Fresh responses, plus ETag-validated copies kept longer for free revalidation
+        self._cache = AnalysisCache(max_entries=2048, ttl=GITHUB_CACHE_TTL)
+        self._etags = AnalysisCache(max_entries=2048, ttl=86400)
+        self._locks: Dict[tuple, asyncio.Lock] = {}
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client so GitHub calls reuse pooled keep-alive connections
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                timeout=10.0
+            )
+        return self._client
+    
+    def start(self) -> httpx.AsyncClient:
+        """
+        Open the shared client (called from the application lifespan)
+        """
+        return self.client
+    
+    async def close(self):
+        """
+        Close the shared client and its pooled connections
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _get_json(self, token: str, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET a GitHub API resource through the per-token TTL cache
+        """
+        token_key = hashlib.blake2b(token.encode(), digest_size=8).hexdigest()
+        key = (token_key, path, tuple(sorted((params or {}).items())))
+        
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        
+        # Concurrent identical lookups wait for a single upstream call
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                cached = self._cache.get(key)
+                if cached is None:
+                    cached = await self._fetch_json(key, token, path, params)
+                    self._cache.set(key, cached)
+                return cached
+        finally:
+            if not lock.locked():
+                self._locks.pop(key, None)
+    
+    async def _fetch_json(self, key: tuple, token: str, path: str, params: Optional[Dict[str, Any]]) -> Any:
+        """
+        Fetch from GitHub, revalidating a previous copy with If-None-Match when possible
+        """
+        headers = {
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github.v3+json"
+        }
+        
+        validated = self._etags.get(key)
+        if validated is not None:
+            headers["If-None-Match"] = validated[0]
+        
+        response = await self.client.get(path, headers=headers, params=params)
+        
+        # 304 responses do not count against the GitHub rate limit
+        if response.status_code == 304 and validated is not None:
+            return validated[1]
+        response.raise_for_status()
+        
+        data = response.json()
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etags.set(key, (etag, data))
+        return data
     
-    def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
+    async def exchange_code_for_token(self, code: str) -> Dict[str, Any]:
         """
         Exchange GitHub OAuth code for access token
         """
@@ -31,35 +120,22 @@ class GitHubService:
         }
         headers = {"Accept": "application/json"}
         
-        response = requests.post(url, data=data, headers=headers)
+        response = await self.client.post(url, data=data, headers=headers)
         response.raise_for_status()
         
         return response.json()
     
-    def get_user_info(self, token: str) -> Dict[str, Any]:
+    async def get_user_info(self, token: str) -> Dict[str, Any]:
         """
         Get authenticated user information
         """
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        
-        response = requests.get(f"{self.base_url}/user", headers=headers)
-        response.raise_for_status()
-        
-        return response.json()
+        return await self._get_json(token, "/user")
     
-    def list_repositories(self, token: str, repo_type: str = "all", per_page: int = 30, page: int = 1) -> Dict[str, Any]:
+    async def list_repositories(self, token: str, repo_type: str = "all", per_page: int = 30, page: int = 1) -> Dict[str, Any]:
         """
         List repositories for the authenticated user
         repo_type: all, owner, public, private, member
         """
-        headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json"
-        }
-        
         params = {
             "type": repo_type,
             "per_page": per_page,
@@ -67,29 +143,10 @@ class GitHubService:
             "sort": "updated"
         }
         
-        response = requests.get(f"{self.base_url}/user/repos", headers=headers, params=params)
-        response.raise_for_status()
-        
-        repos = response.json()
+        repos = await self._get_json(token, "/user/repos", params)
         
         # Process repos to include relevant information
-        processed_repos = []
-        for repo in repos:
-            processed_repos.append({
-                "id": repo["id"],
-                "name": repo["name"],
-                "full_name": repo["full_name"],
-                "description": repo.get("description", ""),
-                "private": repo["private"],
-                "html_url": repo["html_url"],
-                "clone_url": repo["clone_url"],
-                "ssh_url": repo["ssh_url"],
-                "language": repo.get("language"),
-                "stars": repo["stargazers_count"],
-                "forks": repo["forks_count"],
-                "updated_at": repo["updated_at"],
-                "size": repo["size"]
-            })
+        processed_repos = [self._summarize_repository(repo) for repo in repos]
         
         return {
             "repositories": processed_repos,
@@ -98,21 +155,77 @@ class GitHubService:
             "per_page": per_page
         }
     
-    def get_repository_info(self, token: str, owner: str, repo: str) -> Dict[str, Any]:
+    async def list_repositories_all(self, token: str, repo_type: str = "all", per_page: int = 100,
+                                    max_pages: int = 50, max_concurrency: int = 10) -> Dict[str, Any]:
         """
-        Get detailed information about a specific repository
+        List every repository for the authenticated user
+        The first page reveals the page count through its Link header; the rest are fetched concurrently
         """
+        params = {
+            "type": repo_type,
+            "per_page": per_page,
+            "sort": "updated"
+        }
         headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github.v3+json"
         }
         
-        response = requests.get(f"{self.base_url}/repos/{owner}/{repo}", headers=headers)
+        response = await self.client.get("/user/repos", headers=headers, params={**params, "page": 1})
         response.raise_for_status()
+        repos = response.json()
         
-        return response.json()
+        last_url = response.links.get("last", {}).get("url")
+        last_page = int(parse_qs(urlparse(last_url).query)["page"][0]) if last_url else 1
+        last_page = min(last_page, max_pages)
+        
+        # Bounded so a large account does not trip GitHub's secondary rate limits
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_page(page: int) -> List[Dict[str, Any]]:
+            async with semaphore:
+                return await self._get_json(token, "/user/repos", {**params, "page": page})
+        
+        for page_repos in await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1))):
+            repos.extend(page_repos)
+        
+        processed_repos = [self._summarize_repository(repo) for repo in repos]
+        
+        return {
+            "repositories": processed_repos,
+            "total_count": len(processed_repos),
+            "pages": last_page,
+            "per_page": per_page
+        }
+    
+    @staticmethod
+    def _summarize_repository(repo: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Fields of a GitHub repository returned to the frontend
+        """
+        return {
+            "id": repo["id"],
+            "name": repo["name"],
+            "full_name": repo["full_name"],
+            "description": repo.get("description", ""),
+            "private": repo["private"],
+            "html_url": repo["html_url"],
+            "clone_url": repo["clone_url"],
+            "ssh_url": repo["ssh_url"],
+            "language": repo.get("language"),
+            "stars": repo["stargazers_count"],
+            "forks": repo["forks_count"],
+            "updated_at": repo["updated_at"],
+            "size": repo["size"]
+        }
+    
+    async def get_repository_info(self, token: str, owner: str, repo: str) -> Dict[str, Any]:
+        """
+        Get detailed information about a specific repository
+        """
+        return await self._get_json(token, f"/repos/{owner}/{repo}")
     
-    def get_repository_contents(self, token: str, owner: str, repo: str, path: str = "") -> List[Dict[str, Any]]:
+    async def get_repository_contents(self, token: str, owner: str, repo: str, path: str = "") -> List[Dict[str, Any]]:
         """
         Get repository contents at a specific path
         """
@@ -121,12 +234,12 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        response = requests.get(f"{self.base_url}/repos/{owner}/{repo}/contents/{path}", headers=headers)
+        response = await self.client.get(f"/repos/{owner}/{repo}/contents/{path}", headers=headers)
         response.raise_for_status()
         
         return response.json()
     
-    def get_file_content(self, token: str, owner: str, repo: str, path: str) -> str:
+    async def get_file_content(self, token: str, owner: str, repo: str, path: str) -> str:
         """
         Get the content of a specific file
         """
@@ -135,7 +248,7 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json"
         }
         
-        response = requests.get(f"{self.base_url}/repos/{owner}/{repo}/contents/{path}", headers=headers)
+        response = await self.client.get(f"/repos/{owner}/{repo}/contents/{path}", headers=headers)
         response.raise_for_status()
         
         file_data = response.json()
@@ -146,26 +259,79 @@ class GitHubService:
         else:
             return file_data.get("content", "")
     
-    def validate_repository_access(self, token: str, repo_url: str) -> Dict[str, Any]:
+    async def fetch_repository_files(self, owner: str, repo: str, ref: str, extensions,
+                                     token: Optional[str] = None, max_files: int = 2000,
+                                     max_file_size: int = 1_000_000, max_concurrency: int = 20) -> Optional[tuple]:
+        """
+        Directories, file paths and source text (for the given extensions) of a repository at a commit,
+        read through the trees API and raw file downloads instead of a clone
+        Returns None when the repository is too large to fetch this way
+        """
+        headers = {"Accept": "application/vnd.github.v3+json"}
+        if token:
+            headers["Authorization"] = f"token {token}"
+        
+        response = await self.client.get(
+            f"/repos/{owner}/{repo}/git/trees/{ref}", params={"recursive": "1"}, headers=headers
+        )
+        response.raise_for_status()
+        tree = response.json()
+        if tree.get("truncated"):
+            return None
+        
+        directories = [entry["path"] for entry in tree["tree"] if entry["type"] == "tree"]
+        files = [entry["path"] for entry in tree["tree"] if entry["type"] == "blob"]
+        wanted = [
+            entry["path"] for entry in tree["tree"]
+            if entry["type"] == "blob"
+            and os.path.splitext(entry["path"])[1].lower() in extensions
+            and entry.get("size", 0) <= max_file_size
+        ]
+        if len(wanted) > max_files:
+            return None
+        
+        raw_headers = {"Authorization": headers["Authorization"]} if token else None
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch_file(path: str) -> str:
+            async with semaphore:
+                file_response = await self.client.get(
+                    f"https://raw.githubusercontent.com/{owner}/{repo}/{ref}/{quote(path)}", headers=raw_headers
+                )
+                file_response.raise_for_status()
+                return file_response.content.decode("utf-8", errors="ignore")
+        
+        contents = await asyncio.gather(*(fetch_file(path) for path in wanted))
+        return directories, files, dict(zip(wanted, contents))
+    
+    @staticmethod
+    def parse_repository_url(repo_url: str) -> Optional[tuple]:
+        """
+        (owner, repo) for a github.com repository URL, None for anything else
+        """
+        parsed_url = urlparse(repo_url)
+        if parsed_url.hostname not in ['github.com', 'www.github.com']:
+            return None
+        
+        path_parts = parsed_url.path.strip('/').split('/')
+        if len(path_parts) < 2:
+            return None
+        
+        return path_parts[0], path_parts[1].removesuffix('.git')
+    
+    async def validate_repository_access(self, token: str, repo_url: str) -> Dict[str, Any]:
         """
         Validate that the user has access to the specified repository
         """
         try:
             # Parse repository URL to extract owner and repo name
-            parsed_url = urlparse(repo_url)
-            if parsed_url.hostname not in ['github.com', 'www.github.com']:
+            repository = self.parse_repository_url(repo_url)
+            if repository is None:
                 raise ValueError("Invalid GitHub repository URL")
-            
-            # Extract owner and repo from path
-            path_parts = parsed_url.path.strip('/').split('/')
-            if len(path_parts) < 2:
-                raise ValueError("Invalid repository URL format")
-            
-            owner = path_parts[0]
-            repo = path_parts[1].replace('.git', '')
+            owner, repo = repository
             
             # Try to access the repository
-            repo_info = self.get_repository_info(token, owner, repo)
+            repo_info = await self.get_repository_info(token, owner, repo)
             
             return {
                 "valid": True,
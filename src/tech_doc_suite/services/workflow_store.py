@@ -0,0 +1,231 @@
+"""
+Workflow Store - Persistence for workflow state shared across server workers
+Uses Redis when REDIS_URL is configured, otherwise JSON files on local disk
+"""
+
+import os
+import json
+import asyncio
+import logging
+from typing import Dict, Any, Optional
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # redis is optional; fall back to local files
+    redis_asyncio = None
+
+logger = logging.getLogger(__name__)
+
+# Workflows in these states no longer change
+TERMINAL_STATUSES = frozenset({"completed", "failed", "stopped"})
+
+# Writes the given hash fields unless the stored workflow already finished, so a worker still
+# driving a workflow cannot undo a stop or timeout recorded by another worker; returns 1 if written
+_TERMINAL_LUA = ", ".join(f"['{json.dumps(status)}'] = true" for status in sorted(TERMINAL_STATUSES))
+GUARDED_WRITE_SCRIPT = f"""
+local current = redis.call('HGET', KEYS[1], 'status')
+if current and ({{{_TERMINAL_LUA}}})[current] then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class FileWorkflowStore:
+    """Stores each workflow as a JSON file; only visible to the local machine"""
+
+    shared = False
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = storage_dir
+        os.makedirs(storage_dir, exist_ok=True)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def ping(self) -> bool:
+        """Ready when the storage directory can still be written"""
+        return os.access(self.storage_dir, os.W_OK)
+
+    def _path(self, workflow_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{workflow_id}.json")
+
+    def _write(self, workflow_id: str, data: Dict[str, Any]):
+        with open(self._path(workflow_id), 'w') as f:
+            json.dump(data, f, indent=2)
+
+    def _read(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        workflow_file = self._path(workflow_id)
+        if not os.path.exists(workflow_file):
+            return None
+        with open(workflow_file, 'r') as f:
+            return json.load(f)
+
+    def _read_all(self) -> Dict[str, Dict[str, Any]]:
+        workflows = {}
+        for filename in os.listdir(self.storage_dir):
+            if filename.endswith('.json'):
+                workflow_id = filename[:-5]  # Remove .json extension
+                try:
+                    data = self._read(workflow_id)
+                except (OSError, ValueError) as e:
+                    logger.error("Failed to read workflow %s: %s", workflow_id, e)
+                    continue
+                if data:
+                    workflows[workflow_id] = data
+        return workflows
+
+    async def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self._read, workflow_id)
+
+    async def set(self, workflow_id: str, data: Dict[str, Any]) -> bool:
+        """Always written: only this process changes its workflows"""
+        await asyncio.to_thread(self._write, workflow_id, data)
+        return True
+
+    async def update(self, workflow_id: str, **fields) -> bool:
+        data = await self.get(workflow_id) or {}
+        data.update(fields)
+        return await self.set(workflow_id, data)
+
+    async def load_all(self) -> Dict[str, Dict[str, Any]]:
+        return await asyncio.to_thread(self._read_all)
+
+    async def publish(self, workflow_id: str, message):
+        """Nothing to do: status streams live in the only process that changes workflows"""
+        pass
+
+
+class RedisWorkflowStore:
+    """Stores each workflow as a Redis hash so every worker sees the same state"""
+
+    shared = True
+
+    # Keys fetched per pipeline round trip when loading every workflow
+    load_batch_size = 100
+
+    def __init__(self, url: str, ttl: int = 86400, prefix: str = "wf:", max_connections: int = 50,
+                 channel_prefix: str = "wf-status:"):
+        self.pool = redis_asyncio.ConnectionPool.from_url(
+            url, max_connections=max_connections, decode_responses=True
+        )
+        self.client = redis_asyncio.Redis(connection_pool=self.pool)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.channel_prefix = channel_prefix
+        self._guarded_write = self.client.register_script(GUARDED_WRITE_SCRIPT)
+
+    async def start(self):
+        """Fail fast on startup if Redis is unreachable"""
+        await self.client.ping()
+
+    async def close(self):
+        await self.client.aclose()
+        await self.pool.disconnect()
+
+    async def ping(self) -> bool:
+        """Ready when Redis answers a PING"""
+        try:
+            return bool(await self.client.ping())
+        except Exception as e:
+            logger.warning("Redis ping failed: %s", e)
+            return False
+
+    def _key(self, workflow_id: str) -> str:
+        return f"{self.prefix}{workflow_id}"
+
+    async def _write_fields(self, workflow_id: str, fields: Dict[str, Any]) -> bool:
+        """Write the fields unless the stored workflow is already terminal; False if skipped"""
+        # One hash field per top-level attribute, so partial updates stay small
+        args = [self.ttl]
+        for name, value in fields.items():
+            args.extend((name, json.dumps(value)))
+        # Every write pushes the expiry out, so only abandoned workflows age away
+        return bool(await self._guarded_write(keys=[self._key(workflow_id)], args=args))
+
+    @staticmethod
+    def _decode(raw: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        if not raw:
+            return None
+        return {name: json.loads(value) for name, value in raw.items()}
+
+    async def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        return self._decode(await self.client.hgetall(self._key(workflow_id)))
+
+    async def set(self, workflow_id: str, data: Dict[str, Any]) -> bool:
+        return await self._write_fields(workflow_id, data)
+
+    async def update(self, workflow_id: str, **fields) -> bool:
+        return await self._write_fields(workflow_id, fields)
+
+    async def load_all(self) -> Dict[str, Dict[str, Any]]:
+        workflows = {}
+        batch = []
+        async for key in self.client.scan_iter(match=f"{self.prefix}*", count=self.load_batch_size):
+            batch.append(key)
+            if len(batch) >= self.load_batch_size:
+                await self._load_batch(batch, workflows)
+                batch = []
+        if batch:
+            await self._load_batch(batch, workflows)
+        return workflows
+
+    async def publish(self, workflow_id: str, message):
+        """Announce a status change to every worker listening for status events"""
+        try:
+            await self.client.publish(f"{self.channel_prefix}{workflow_id}", message)
+        except Exception as e:
+            logger.warning("Status publish failed for %s: %s", workflow_id, e)
+
+    async def listen(self):
+        """Yield (workflow_id, message) for status changes published by any worker"""
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.psubscribe(f"{self.channel_prefix}*")
+        try:
+            async for message in pubsub.listen():
+                if message["type"] == "pmessage":
+                    yield message["channel"][len(self.channel_prefix):], message["data"]
+        finally:
+            await pubsub.reset()
+
+    async def load_page(self, cursor: int, count: int, fields) -> tuple:
+        """One SCAN step; returns the next cursor (0 when done) and the selected fields"""
+        cursor, keys = await self.client.scan(cursor=cursor, match=f"{self.prefix}*", count=count)
+        page = []
+        if keys:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    pipe.hmget(key, fields)
+                results = await pipe.execute()
+            for values in results:
+                if values[0] is not None:
+                    page.append({name: json.loads(value) if value is not None else None
+                                 for name, value in zip(fields, values)})
+        return cursor, page
+
+    async def _load_batch(self, keys, workflows: Dict[str, Dict[str, Any]]):
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            results = await pipe.execute()
+        for key, raw in zip(keys, results):
+            data = self._decode(raw)
+            if data:
+                workflows[key[len(self.prefix):]] = data
+
+
+def create_workflow_store(storage_dir: str):
+    """Pick the Redis store when REDIS_URL is set and redis is installed"""
+    redis_url = os.getenv('REDIS_URL')
+    if redis_url:
+        if redis_asyncio is not None:
+            ttl = int(os.getenv('WORKFLOW_TTL_SECONDS', '86400'))
+            logger.info("Using Redis workflow store")
+            return RedisWorkflowStore(redis_url, ttl=ttl)
+        logger.warning("REDIS_URL is set but the redis package is not installed; using file storage")
+    return FileWorkflowStore(storage_dir)
@@ -0,0 +1,44 @@
+"""
+Task Queue - Run documentation workflows on Celery worker processes
+Enabled when CELERY_BROKER_URL is set; workflow state is exchanged through the Redis store
+Start workers with: celery -A tech_doc_suite.tasks worker --concurrency=4
+"""
+
+import os
+import asyncio
+import logging
+from typing import Dict, Any
+
+try:
+    from celery import Celery
+except ImportError:  # celery is optional; workflows then run in the API process
+    Celery = None
+
+logger = logging.getLogger(__name__)
+
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+
+celery_app = None
+if CELERY_BROKER_URL:
+    if Celery is not None:
+        celery_app = Celery(
+            "docsuite",
+            broker=CELERY_BROKER_URL,
+            backend=os.getenv('CELERY_RESULT_BACKEND')
+        )
+        # Workflows run for minutes, so each worker process takes one at a time
+        celery_app.conf.worker_prefetch_multiplier = 1
+    else:
+        logger.warning("CELERY_BROKER_URL is set but the celery package is not installed; running workflows in-process")
+
+run_doc_workflow = None
+if celery_app is not None:
+    @celery_app.task(name="tech_doc_suite.run_doc_workflow", acks_late=True)
+    def run_doc_workflow(workflow_id: str, request_data: Dict[str, Any], use_real_analysis: bool):
+        """Drive one documentation workflow to completion on this worker"""
+        # Imported lazily: main imports this module to enqueue tasks
+        try:
+            from .main import run_workflow_task
+        except ImportError:
+            from tech_doc_suite.main import run_workflow_task
+        asyncio.run(run_workflow_task(workflow_id, request_data, use_real_analysis))
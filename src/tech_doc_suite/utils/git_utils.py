@@ -1,9 +1,47 @@
+import atexit
 import tempfile
 import shutil
 import subprocess
 import os
-from urllib.parse import urlparse, urlunparse
-from typing import Optional
+from functools import lru_cache
+from urllib.parse import urlparse
+from typing import Dict, Optional
+
+# Answers git's credential prompts from the environment so tokens never appear in argv or URLs
+_ASKPASS_SCRIPT = """#!/bin/sh
+case "$1" in
+    Username*) printf '%s\\n' "$GIT_USERNAME" ;;
+    *) printf '%s\\n' "$GIT_PASSWORD" ;;
+esac
+"""
+
+@lru_cache(maxsize=1)
+def _askpass_path() -> str:
+    """Write the askpass helper once per process and return its path"""
+    fd, path = tempfile.mkstemp(prefix="git-askpass-", suffix=".sh")
+    with os.fdopen(fd, 'w') as f:
+        f.write(_ASKPASS_SCRIPT)
+    os.chmod(path, 0o700)
+    atexit.register(os.remove, path)
+    return path
+
+def git_auth_env(github_token: Optional[str] = None, github_username: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the environment for a non-interactive git command
+    
+    Args:
+        github_token: GitHub personal access token for private repos
+        github_username: GitHub username (GitHub accepts any name alongside a token)
+    
+    Returns:
+        Dict[str, str]: Environment that authenticates through GIT_ASKPASS
+    """
+    env = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+    if github_token:
+        env['GIT_ASKPASS'] = _askpass_path()
+        env['GIT_USERNAME'] = github_username or 'x-access-token'
+        env['GIT_PASSWORD'] = github_token
+    return env
 
 def clone_repo(repo_url: str, github_token: Optional[str] = None, github_username: Optional[str] = None):
     """
@@ -24,16 +62,16 @@ def clone_repo(repo_url: str, github_token: Optional[str] = None, github_usernam
         clone_url = repo_url
         
         if github_token:
-            clone_url = _add_auth_to_url(repo_url, github_token, github_username)
+            clone_url = _https_clone_url(repo_url)
         
-        # Clone the repository
+        # Clone the repository; credentials are supplied through GIT_ASKPASS
         subprocess.check_call([
             'git', 'clone', 
             '--depth', '1',
             '--quiet',
             clone_url, 
             temp_dir
-        ])
+        ], env=git_auth_env(github_token, github_username))
         
         return temp_dir
         
@@ -47,47 +85,21 @@ def clone_repo(repo_url: str, github_token: Optional[str] = None, github_usernam
         shutil.rmtree(temp_dir)
         raise RuntimeError(f"Unexpected error during repository cloning: {e}")
 
-def _add_auth_to_url(repo_url: str, github_token: str, github_username: Optional[str] = None) -> str:
+def _https_clone_url(repo_url: str) -> str:
     """
-    Add authentication to a GitHub repository URL
+    Convert a GitHub SSH URL to HTTPS so token authentication can be used
     
     Args:
         repo_url: Original repository URL
-        github_token: GitHub personal access token
-        github_username: GitHub username (optional)
     
     Returns:
-        str: Authenticated repository URL
+        str: HTTPS repository URL, or the URL unchanged for other formats
     """
-    parsed = urlparse(repo_url)
-    
-    # Handle different URL formats
-    if parsed.hostname and 'github.com' in parsed.hostname:
-        # For HTTPS URLs, add token authentication
-        if parsed.scheme == 'https':
-            # Use token as username for GitHub's token authentication
-            auth_netloc = f"{github_token}@{parsed.hostname}"
-            if parsed.port:
-                auth_netloc += f":{parsed.port}"
-            
-            auth_url = urlunparse((
-                parsed.scheme,
-                auth_netloc,
-                parsed.path,
-                parsed.params,
-                parsed.query,
-                parsed.fragment
-            ))
-            return auth_url
-        
-        # For SSH URLs, convert to HTTPS with token
-        elif parsed.scheme == 'ssh' or repo_url.startswith('git@'):
-            # Extract owner/repo from SSH URL
-            if repo_url.startswith('git@github.com:'):
-                path = repo_url.replace('git@github.com:', '')
-                if path.endswith('.git'):
-                    path = path[:-4]
-                return f"https://{github_token}@github.com/{path}.git"
+    if repo_url.startswith('git@github.com:'):
+        path = repo_url.replace('git@github.com:', '')
+        if path.endswith('.git'):
+            path = path[:-4]
+        return f"https://github.com/{path}.git"
     
     # For other formats, try to use the URL as-is
     return repo_url
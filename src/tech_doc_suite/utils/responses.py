@@ -0,0 +1,39 @@
+"""
+Response classes shared by the API
+"""
+
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def dumps_json(content: Any, indent: bool = False) -> bytes:
+    """Encode content the same way FastJSONResponse renders it, optionally pretty-printed"""
+    if orjson is None:
+        return json.dumps(
+            jsonable_encoder(content),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":")
+        ).encode("utf-8")
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(content, option=option)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed
+
+    Handlers may return datetimes directly; orjson encodes them natively and the
+    stdlib fallback converts them with jsonable_encoder first.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -0,0 +1,150 @@
+"""Analysis caches: the local LRU, the Redis-backed cache shared between workers and the disk cache"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite.services.analysis_cache import AnalysisCache, DiskCache, SharedAnalysisCache
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis.asyncio GET/SET calls the shared cache makes"""
+
+    def __init__(self):
+        self.values = {}
+        self.expiries = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.expiries[key] = ex
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("redis is down")
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = AnalysisCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries():
+    cache = AnalysisCache(ttl=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+async def test_shared_cache_without_redis_stays_local():
+    cache = SharedAnalysisCache(AnalysisCache())
+    await cache.set(("repo", "sha"), {"file_count": 3})
+
+    assert await cache.get(("repo", "sha")) == {"file_count": 3}
+    assert await cache.get(("repo", "other")) is None
+
+
+async def test_shared_cache_reads_another_workers_entry():
+    redis = FakeRedis()
+    writer = SharedAnalysisCache(AnalysisCache(ttl=600), redis, prefix="analysis:")
+    reader_local = AnalysisCache()
+    reader = SharedAnalysisCache(reader_local, redis, prefix="analysis:")
+
+    await writer.set(("repo", "sha"), {"file_count": 3})
+
+    assert await reader.get(("repo", "sha")) == {"file_count": 3}
+    # The value read from Redis is kept locally for the next lookup
+    assert reader_local.get(("repo", "sha")) == {"file_count": 3}
+    key, = redis.values
+    assert key.startswith("analysis:")
+    assert redis.expiries[key] == 600
+
+
+async def test_shared_cache_prefixes_keep_caches_apart():
+    redis = FakeRedis()
+    analysis = SharedAnalysisCache(AnalysisCache(), redis, prefix="analysis:")
+    documentation = SharedAnalysisCache(AnalysisCache(), redis, prefix="documentation:")
+
+    await analysis.set(("repo", "sha"), {"file_count": 3})
+
+    assert await documentation.get(("repo", "sha")) is None
+
+
+async def test_shared_cache_survives_redis_errors():
+    cache = SharedAnalysisCache(AnalysisCache(), BrokenRedis())
+
+    await cache.set("key", "value")
+
+    assert await cache.get("key") == "value"
+    assert await cache.get("missing") is None
+
+
+def age(cache, key, seconds):
+    """Backdate an entry's modification time"""
+    path = cache._path(key)
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+def test_disk_cache_creates_directory_on_first_write(tmp_path):
+    directory = tmp_path / "documentation"
+    cache = DiskCache(str(directory))
+
+    assert not directory.exists()
+    assert cache.get("prompt") is None
+
+    cache.set("prompt", "# Docs")
+
+    assert cache.get("prompt") == "# Docs"
+
+
+def test_disk_cache_serves_expired_entries_only_as_stale(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=60)
+    cache.set("prompt", "# Docs")
+    age(cache, "prompt", 120)
+
+    assert cache.get("prompt") is None
+    assert cache.get("prompt", allow_stale=True) == "# Docs"
+
+
+def test_disk_cache_evicts_oldest_entries(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=2)
+    cache.set("old", "1")
+    cache.set("newer", "2")
+    age(cache, "old", 30)
+    age(cache, "newer", 20)
+
+    cache.set("newest", "3")
+
+    assert cache.get("old", allow_stale=True) is None
+    assert cache.get("newer") == "2"
+    assert cache.get("newest") == "3"
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_disk_cache_failed_write_leaves_no_temporary_file(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache.set("prompt", "# Docs")
+
+    assert os.listdir(tmp_path) == []
+    assert cache.get("prompt", allow_stale=True) is None
@@ -0,0 +1,88 @@
+"""Code analysis of a checkout matches analysis of the same files fetched without a clone"""
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite.agents.code_analyzer import CodeAnalyzerAgent, LANGUAGE_BY_EXTENSION
+
+REPOSITORY = {
+    "README.md": "# Sample\n",
+    "app/__init__.py": "",
+    "app/service.py": (
+        "import os\n"
+        "from json import dumps\n"
+        "\n"
+        "class Service:\n"
+        "    def run(self):\n"
+        "        return dumps(os.environ.copy())\n"
+        "\n"
+        "def main():\n"
+        "    Service().run()\n"
+    ),
+    "web/src/index.js": (
+        "import React from 'react';\n"
+        "export function render() { return null; }\n"
+        "class App extends React.Component {}\n"
+    ),
+    "web/src/Widget.java": "public class Widget {\n    public void draw() {}\n}\n",
+    "docs/notes.txt": "not source\n",
+}
+
+
+@pytest.fixture
+def repository(tmp_path):
+    for rel_path, content in REPOSITORY.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+    # Git metadata is never part of the analysis
+    (tmp_path / ".git" / "objects").mkdir(parents=True)
+    (tmp_path / ".git" / "HEAD").write_text("ref: refs/heads/main\n")
+    return tmp_path
+
+
+def tree_listing():
+    """Directories, files and sources as the GitHub trees API and raw downloads report them"""
+    files = list(REPOSITORY)
+    directories = sorted({
+        os.path.join(*parts[:depth])
+        for parts in (rel_path.split("/") for rel_path in files)
+        for depth in range(1, len(parts))
+    })
+    sources = {
+        os.path.join(*rel_path.split("/")): content
+        for rel_path, content in REPOSITORY.items()
+        if os.path.splitext(rel_path)[1].lower() in LANGUAGE_BY_EXTENSION
+    }
+    return directories, [os.path.join(*rel_path.split("/")) for rel_path in files], sources
+
+
+def normalized(analysis):
+    """Analysis with order-insensitive parts sorted, since walk and tree orders differ"""
+    return {
+        **analysis,
+        "structure": {directory: sorted(names) for directory, names in analysis["structure"].items()},
+        "functions": sorted(analysis["functions"], key=repr),
+        "classes": sorted(analysis["classes"], key=repr),
+        "dependencies": sorted(analysis["dependencies"]),
+    }
+
+
+def test_analyze_sources_matches_analyze_repository(repository):
+    analyzer = CodeAnalyzerAgent("code_analyzer_test")
+
+    from_checkout = analyzer.analyze_repository(str(repository))
+    from_tree = analyzer.analyze_sources(*tree_listing())
+
+    assert normalized(from_tree) == normalized(from_checkout)
+
+
+def test_analysis_skips_git_metadata_and_non_source_files(repository):
+    analysis = CodeAnalyzerAgent("code_analyzer_test").analyze_repository(str(repository))
+
+    assert not any(directory.startswith(".git") for directory in analysis["structure"])
+    assert "notes.txt" in analysis["structure"]["docs"]
+    assert analysis["file_count"] == 4
+    assert {"python", "javascript", "java"} <= set(analysis["language_distribution"])
@@ -0,0 +1,98 @@
+"""POST /generate admission: shedding load when saturated and coalescing duplicate requests"""
+import asyncio
+import os
+import sys
+from collections import OrderedDict
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite import main
+from tech_doc_suite.main import DocumentationRequest, WorkflowStatus, workflow_request_key
+from tech_doc_suite.services.workflow_store import FileWorkflowStore
+
+REQUEST = {
+    "repository_url": "https://github.com/octocat/Hello-World",
+    "project_id": "hello-world",
+}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Client over a fresh file store with empty registries; the lifespan is not started"""
+    monkeypatch.setattr(main, "workflow_store", FileWorkflowStore(str(tmp_path)))
+    monkeypatch.setattr(main, "workflows", OrderedDict())
+    monkeypatch.setattr(main, "inflight_workflows", {})
+    monkeypatch.setattr(main, "agent_execution_queue", {})
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def saturated(monkeypatch):
+    """Every workflow slot is in use"""
+    monkeypatch.setattr(main, "workflow_slots", asyncio.Semaphore(0))
+
+
+def test_generate_sheds_load_with_retry_after(client, saturated):
+    response = client.post("/generate", json=REQUEST)
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == str(main.WORKFLOW_RETRY_AFTER_SECONDS)
+    # Nothing was created for the rejected request
+    assert not main.workflows
+
+
+def start_inflight(request_data):
+    """Register a running workflow for the request, as an earlier identical submission would"""
+    workflow = WorkflowStatus("inflight", "processing", 20, "Working", main._utcnow())
+    main.remember_workflow(workflow)
+    main.inflight_workflows[workflow_request_key(DocumentationRequest(**request_data))] = workflow.workflow_id
+    return workflow
+
+
+def test_duplicate_request_joins_running_workflow(client, saturated):
+    workflow = start_inflight(REQUEST)
+
+    response = client.post("/generate", json=REQUEST)
+
+    assert response.status_code == 202
+    data = response.json()["data"]
+    assert data["workflow_id"] == workflow.workflow_id
+    assert data["deduplicated"] is True
+
+
+def test_no_cache_request_is_never_coalesced(client, saturated):
+    start_inflight(REQUEST)
+
+    # Not attached to the running workflow, so it competes for a slot like any new request
+    response = client.post("/generate", json={**REQUEST, "no_cache": True})
+
+    assert response.status_code == 429
+
+
+def test_finished_workflow_is_not_joined(client, saturated):
+    workflow = start_inflight(REQUEST)
+    main.forget_workflow(workflow.workflow_id)
+
+    assert client.post("/generate", json=REQUEST).status_code == 429
+
+
+@pytest.mark.parametrize("changes", [
+    {"output_formats": ["pdf"]},
+    {"include_diagrams": False},
+    {"github_username": "octocat"},
+    {"github_token": "token"},
+    {"target_audience": "end-users"},
+    {"translation_languages": ["fr"]},
+])
+def test_request_key_distinguishes_outputs(changes):
+    assert workflow_request_key(DocumentationRequest(**REQUEST, **changes)) != \
+        workflow_request_key(DocumentationRequest(**REQUEST))
+
+
+def test_request_key_ignores_option_order():
+    first = DocumentationRequest(**REQUEST, output_formats=["html", "markdown"], translation_languages=["fr", "de"])
+    second = DocumentationRequest(**REQUEST, output_formats=["markdown", "html"], translation_languages=["de", "fr"])
+
+    assert workflow_request_key(first) == workflow_request_key(second)
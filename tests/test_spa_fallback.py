@@ -0,0 +1,34 @@
+"""React routes fall back to index.html while API paths keep their 404"""
+import os
+import sys
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite.main import SPAStaticFiles
+
+INDEX = "<!doctype html><div id=\"root\"></div>"
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "index.html").write_text(INDEX)
+    app = FastAPI()
+    app.mount("/", SPAStaticFiles(directory=tmp_path, html=True), name="spa")
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/", "/generate", "/status", "/about", "/documentation/abc"])
+def test_frontend_routes_serve_index(client, path):
+    response = client.get(path)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.text == INDEX
+
+
+@pytest.mark.parametrize("path", ["/api/unknown", "/status/abc/extra", "/health/deep", "/static/missing.js"])
+def test_api_and_asset_paths_keep_404(client, path):
+    assert client.get(path).status_code == 404
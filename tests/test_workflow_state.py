@@ -0,0 +1,125 @@
+"""Workflow state: serialization for the store and reloading workflows the process no longer holds"""
+import os
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite import main
+from tech_doc_suite.main import AgentStatus, WorkflowStatus
+from tech_doc_suite.services.workflow_store import FileWorkflowStore
+
+
+class SharedFileWorkflowStore(FileWorkflowStore):
+    """File store that behaves as if other workers could change it"""
+
+    shared = True
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """A fresh file store and empty in-memory registries for each test"""
+    store = FileWorkflowStore(str(tmp_path))
+    monkeypatch.setattr(main, "workflow_store", store)
+    monkeypatch.setattr(main, "workflows", OrderedDict())
+    monkeypatch.setattr(main, "running_workflows", set())
+    monkeypatch.setattr(main, "agent_execution_queue", {})
+    monkeypatch.setattr(main, "agent_transition_history", {})
+    return store
+
+
+def make_workflow(workflow_id="wf1", status="processing"):
+    started = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    return WorkflowStatus(
+        workflow_id=workflow_id,
+        status=status,
+        progress=40,
+        message="Agent Doc Writer is processing",
+        created_at=started,
+        current_agent="doc_writer",
+        agents={
+            "code_analyzer": AgentStatus(
+                "code_analyzer", "Code Analyzer", "completed", 100, "Analysis complete",
+                started_at=started, completed_at=started
+            ),
+            "doc_writer": AgentStatus("doc_writer", "Documentation Writer", "active", 50, started_at=started),
+        },
+        result={"documentation": "# Docs", "quality": {"overall_score": 90}},
+        ai_powered=True,
+    )
+
+
+def test_workflow_dict_round_trip():
+    workflow = make_workflow()
+
+    restored = WorkflowStatus.from_dict(workflow.to_dict())
+
+    assert restored == workflow
+    assert restored.to_dict() == workflow.to_dict()
+
+
+def test_agent_dict_round_trip():
+    agent = make_workflow().agents["code_analyzer"]
+
+    assert AgentStatus.from_dict(agent.to_dict()) == agent
+
+
+def test_from_dict_reads_naive_timestamps_as_utc():
+    data = make_workflow().to_dict()
+    data["created_at"] = "2024-01-01T12:00:00"
+
+    assert WorkflowStatus.from_dict(data).created_at.tzinfo is not None
+
+
+async def test_get_workflow_reloads_forgotten_workflow(store):
+    workflow = make_workflow()
+    main.remember_workflow(workflow)
+    await main.save_workflow(workflow.workflow_id, workflow)
+    main.forget_workflow(workflow.workflow_id)
+
+    reloaded = await main.get_workflow(workflow.workflow_id)
+
+    assert reloaded == workflow
+    assert main.workflows[workflow.workflow_id] is reloaded
+
+
+async def test_get_workflow_missing_everywhere(store):
+    assert await main.get_workflow("missing") is None
+
+
+async def test_get_workflow_rereads_shared_store_when_driven_elsewhere(tmp_path, store, monkeypatch):
+    shared = SharedFileWorkflowStore(str(tmp_path))
+    monkeypatch.setattr(main, "workflow_store", shared)
+    workflow = make_workflow()
+    main.remember_workflow(workflow)
+    await shared.set(workflow.workflow_id, workflow.to_dict())
+    # Another worker finishes the workflow in the shared store
+    await shared.update(workflow.workflow_id, status="completed", progress=100)
+
+    current = await main.get_workflow(workflow.workflow_id)
+
+    assert current.status == "completed"
+    assert current.progress == 100
+
+
+async def test_get_workflow_keeps_local_state_while_driven_here(tmp_path, store, monkeypatch):
+    shared = SharedFileWorkflowStore(str(tmp_path))
+    monkeypatch.setattr(main, "workflow_store", shared)
+    workflow = make_workflow()
+    main.remember_workflow(workflow)
+    main.running_workflows.add(workflow.workflow_id)
+    await shared.set(workflow.workflow_id, make_workflow(status="completed").to_dict())
+
+    assert await main.get_workflow(workflow.workflow_id) is workflow
+
+
+def test_forget_workflow_drops_its_agent_queue(store):
+    workflow = make_workflow(status="completed")
+    main.remember_workflow(workflow)
+    main.agent_execution_queue[workflow.workflow_id] = main.deque(["doc_writer"])
+
+    main.forget_workflow(workflow.workflow_id)
+
+    assert workflow.workflow_id not in main.agent_execution_queue
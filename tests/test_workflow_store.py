@@ -0,0 +1,116 @@
+"""Workflow stores: file round trips and paging through the shared Redis store"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+from tech_doc_suite.services.workflow_store import FileWorkflowStore
+
+
+def workflow_data(workflow_id, status="processing", **fields):
+    data = {
+        "workflow_id": workflow_id,
+        "status": status,
+        "progress": 5,
+        "message": "Workflow initialized",
+        "created_at": "2024-01-01T00:00:00+00:00",
+        "completed_at": None,
+        "current_agent": None,
+        "agents": {},
+        "result": None,
+        "ai_powered": False,
+    }
+    data.update(fields)
+    return data
+
+
+async def test_file_store_round_trip(tmp_path):
+    store = FileWorkflowStore(str(tmp_path))
+    data = workflow_data("wf1")
+
+    assert await store.set("wf1", data) is True
+    assert await store.get("wf1") == data
+    assert await store.get("missing") is None
+
+
+async def test_file_store_update_merges_fields(tmp_path):
+    store = FileWorkflowStore(str(tmp_path))
+    await store.set("wf1", workflow_data("wf1", result={"documentation": "# Docs"}))
+
+    assert await store.update("wf1", status="stopped", progress=100) is True
+
+    stored = await store.get("wf1")
+    assert stored["status"] == "stopped"
+    assert stored["progress"] == 100
+    assert stored["result"] == {"documentation": "# Docs"}
+
+
+async def test_file_store_load_all_skips_unreadable_files(tmp_path):
+    store = FileWorkflowStore(str(tmp_path))
+    await store.set("wf1", workflow_data("wf1"))
+    await store.set("wf2", workflow_data("wf2", status="completed"))
+    (tmp_path / "broken.json").write_text("{not json")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    loaded = await store.load_all()
+
+    assert sorted(loaded) == ["wf1", "wf2"]
+    assert loaded["wf2"]["status"] == "completed"
+
+
+class FakePipeline:
+    """Just enough of a redis.asyncio pipeline to queue HMGETs"""
+
+    def __init__(self, hashes):
+        self.hashes = hashes
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def hmget(self, key, fields):
+        self.commands.append((key, fields))
+
+    async def execute(self):
+        return [[self.hashes.get(key, {}).get(name) for name in fields] for key, fields in self.commands]
+
+
+class FakeRedis:
+    """SCAN over a fixed key order, returning at most ``count`` keys per step"""
+
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    async def scan(self, cursor, match, count):
+        keys = sorted(key for key in self.hashes if key.startswith(match.rstrip("*")))
+        page = keys[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(keys) else 0
+        return next_cursor, page
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self.hashes)
+
+
+async def test_redis_store_load_page_walks_every_workflow():
+    pytest.importorskip("redis")
+    from tech_doc_suite.services.workflow_store import RedisWorkflowStore
+
+    store = RedisWorkflowStore("redis://localhost:6379/0")
+    store.client = FakeRedis({
+        f"wf:{workflow_id}": {name: json.dumps(value) for name, value in workflow_data(workflow_id).items()}
+        for workflow_id in ("a", "b", "c")
+    })
+    fields = ("workflow_id", "status", "progress")
+
+    cursor, first = await store.load_page(0, 2, fields)
+    assert cursor != 0
+    cursor, second = await store.load_page(cursor, 2, fields)
+    assert cursor == 0
+
+    assert [row["workflow_id"] for row in first + second] == ["a", "b", "c"]
+    assert first[0] == {"workflow_id": "a", "status": "processing", "progress": 5}